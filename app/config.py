@@ -14,6 +14,24 @@ class Settings(BaseSettings):
     # OCR Configuration
     ocr_language: str = "en"
     use_gpu: bool = False
+    ocr_rec_batch_num: int = 1  # Text lines recognized per batch; raise on GPU
+    ocr_max_cached_langs: int = 3  # PaddleOCR instances kept loaded (LRU)
+    ocr_recycle_after: int = 500  # Rebuild an instance after this many uses (0 = never)
+    ocr_preload: bool = True  # Load configured languages in the background at startup
+    ocr_parallel_workers: int = 4  # Threads for multilingual OCR passes (1 = serial)
+    ocr_adaptive_multilingual: bool = False  # Skip passes for scripts the first pass ruled out
+    ocr_adaptive_min_confidence: float = 0.85  # First-pass confidence needed to skip passes
+    
+    # Key-Value Extraction
+    kv_bytes_regex: bool = False  # Run extraction regexes over UTF-8 bytes
+    
+    # PDF embedded-data extraction
+    pdf_workers: int = 0  # Worker processes for per-page scans (0/1 = serial)
+    pdf_parallel_min_pages: int = 64  # Only parallelize documents this long
+    
+    # Table extraction
+    table_workers: int = 0  # Worker processes for Camelot page parsing (0/1 = serial)
+    table_parallel_min_pages: int = 16  # Only parallelize page ranges this long
     
     # Chunking
     chunk_size: int = 512
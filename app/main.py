@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
 from app.api.routes import router
 from app.services.elasticsearch_service import get_elasticsearch_service
+from app.services.ocr_service import get_ocr_service
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +32,12 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("Elasticsearch not available - some features may not work")
     
+    # Create the OCR service now so its preload thread loads the models
+    # while the app starts, not on the first upload
+    if get_settings().ocr_preload:
+        get_ocr_service()
+        logger.info("Preloading OCR models in the background")
+    
     yield
     
     # Shutdown
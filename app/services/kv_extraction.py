@@ -2,12 +2,30 @@
 import logging
 import re
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 
+from app.config import get_settings
 from app.models.document import KeyValuePair, BoundingBox
 
 logger = logging.getLogger(__name__)
 
+# Try to import hyperscan - it's optional (multi-pattern prefilter)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Pattern: Key: Value (supports Devanagari danda ।, colon, etc.)
+# Supports: Latin, Devanagari, Bengali, Telugu, Tamil, Kannada, Malayalam, Gujarati, Punjabi, Odia scripts
+_COLON_PAIR_RE = re.compile(
+    r'^([A-Za-z\u0900-\u097F\u0980-\u09FF\u0A00-\u0A7F\u0A80-\u0AFF\u0B00-\u0B7F\u0B80-\u0BFF\u0C00-\u0C7F\u0C80-\u0CFF\u0D00-\u0D7F][^\n:।]{1,50})\s*[:।]\s*(.+?)$',
+    re.MULTILINE
+)
+
 
 # ============================================================================
 # INDIAN LANGUAGES - MULTILINGUAL LABEL MAPPINGS
@@ -283,12 +301,71 @@ LEGAL_LABELS = {
 }
 
 
+# Flat, index-aligned view of both label tables: _FIELDS[i] is
+# "<source>.<field>" ("gen" or "legal") and _LABELS[i] the label itself.
+_FIELDS: Tuple[str, ...]
+_LABELS: Tuple[str, ...]
+_FIELDS, _LABELS = zip(*(
+    (f"{source}.{field}", label)
+    for labels_dict, source in ((MULTILINGUAL_LABELS, "gen"), (LEGAL_LABELS, "legal"))
+    for field, langs in labels_dict.items()
+    for labels in langs.values()
+    for label in labels
+))
+_LABELS_LOWER: Tuple[str, ...] = tuple(label.lower() for label in _LABELS)
+
+# Trailing characters that mark a block as a label (colon, Devanagari danda)
+_LABEL_END_CHARS = frozenset(':।')
+
+
+def _labels_to_trie_regex(labels: List[str]) -> str:
+    """
+    Render labels as a prefix-trie regex alternation.
+
+    Labels sharing a prefix are collapsed so the regex engine matches the
+    common prefix once, e.g. ["पूरा नाम", "पूरा नाव"] -> "पूरा\\ ना(?:म|व)".
+    Longer labels are preferred over their prefixes.
+    """
+    trie: Dict[str, Dict] = {}
+    for label in labels:
+        node = trie
+        for char in label:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End-of-label marker
+
+    def _render(node: Dict[str, Dict]) -> str:
+        is_end = "" in node
+        branches = [
+            re.escape(char) + _render(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        alternation = f"(?:{'|'.join(branches)})"
+        return f"{alternation}?" if is_end else alternation
+
+    return _render(trie)
+
+
 @dataclass
 class ExtractionPattern:
     """Pattern for extracting key-value pairs."""
     key_name: str
     pattern: str
     flags: int = re.IGNORECASE
+    regex: re.Pattern = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Compile once so extraction doesn't go through the re module cache
+        self.regex = re.compile(self.pattern, self.flags)
+    
+    @cached_property
+    def byte_regex(self) -> re.Pattern:
+        """Same pattern compiled for matching UTF-8 encoded text."""
+        return re.compile(self.pattern.encode("utf-8"), self.flags)
 
 
 class KVExtractionService:
@@ -302,30 +379,49 @@ class KVExtractionService:
     """
     
     def __init__(self):
-        self.patterns = self._get_default_patterns()
-        self.legal_patterns = self._get_legal_document_patterns()
+        settings = get_settings()
+        self.use_bytes_regex = settings.kv_bytes_regex
         self.multilingual_labels = MULTILINGUAL_LABELS
         self.legal_labels = LEGAL_LABELS
+        # Lowercased label set for O(1) exact-match lookups in _is_label
+        self._all_labels_lower = frozenset(_LABELS_LOWER)
+    
+    # Pattern sets (and their prefilters) are built on first use, so callers
+    # that never request legal extraction never compile the legal patterns.
+    
+    @cached_property
+    def patterns(self) -> List[ExtractionPattern]:
+        return self._get_default_patterns()
+    
+    @cached_property
+    def legal_patterns(self) -> List[ExtractionPattern]:
+        return self._get_legal_document_patterns()
+    
+    @cached_property
+    def _prefilter(self):
+        return self._build_prefilter(self.patterns)
     
-    def _build_multilingual_pattern(self, field: str, labels_dict: Dict) -> str:
-        """Build regex pattern from multilingual labels."""
-        all_labels = []
-        for lang, labels in labels_dict.get(field, {}).items():
-            all_labels.extend(labels)
+    @cached_property
+    def _legal_prefilter(self):
+        return self._build_prefilter(self.legal_patterns)
+    
+    def _build_multilingual_pattern(self, field: str, source: str = "gen") -> str:
+        """Build regex pattern from multilingual labels ("gen" or "legal" table)."""
+        key = f"{source}.{field}"
+        all_labels = [_LABELS[i] for i, f in enumerate(_FIELDS) if f == key]
         
         if not all_labels:
             return None
         
-        # Escape special regex characters and join
-        escaped = [re.escape(label) for label in all_labels]
-        return "|".join(escaped)
+        # Collapse shared prefixes into a trie-shaped alternation
+        return _labels_to_trie_regex(all_labels)
     
     def _get_default_patterns(self) -> List[ExtractionPattern]:
         """Get default extraction patterns with multilingual support."""
         patterns = []
         
         # Date pattern (multilingual)
-        date_labels = self._build_multilingual_pattern("date", MULTILINGUAL_LABELS)
+        date_labels = self._build_multilingual_pattern("date")
         if date_labels:
             patterns.append(ExtractionPattern(
                 "date",
@@ -334,7 +430,7 @@ class KVExtractionService:
             ))
         
         # Name pattern (multilingual)
-        name_labels = self._build_multilingual_pattern("name", MULTILINGUAL_LABELS)
+        name_labels = self._build_multilingual_pattern("name")
         if name_labels:
             patterns.append(ExtractionPattern(
                 "name",
@@ -343,7 +439,7 @@ class KVExtractionService:
             ))
         
         # Phone pattern (multilingual)
-        phone_labels = self._build_multilingual_pattern("phone", MULTILINGUAL_LABELS)
+        phone_labels = self._build_multilingual_pattern("phone")
         if phone_labels:
             patterns.append(ExtractionPattern(
                 "phone",
@@ -352,7 +448,7 @@ class KVExtractionService:
             ))
         
         # Amount pattern (multilingual)
-        amount_labels = self._build_multilingual_pattern("amount", MULTILINGUAL_LABELS)
+        amount_labels = self._build_multilingual_pattern("amount")
         if amount_labels:
             patterns.append(ExtractionPattern(
                 "amount",
@@ -361,7 +457,7 @@ class KVExtractionService:
             ))
         
         # Address pattern (multilingual)
-        address_labels = self._build_multilingual_pattern("address", MULTILINGUAL_LABELS)
+        address_labels = self._build_multilingual_pattern("address")
         if address_labels:
             patterns.append(ExtractionPattern(
                 "address",
@@ -370,7 +466,7 @@ class KVExtractionService:
             ))
         
         # Father's name (multilingual)
-        father_labels = self._build_multilingual_pattern("father_name", MULTILINGUAL_LABELS)
+        father_labels = self._build_multilingual_pattern("father_name")
         if father_labels:
             patterns.append(ExtractionPattern(
                 "father_name",
@@ -379,7 +475,7 @@ class KVExtractionService:
             ))
         
         # Age (multilingual)
-        age_labels = self._build_multilingual_pattern("age", MULTILINGUAL_LABELS)
+        age_labels = self._build_multilingual_pattern("age")
         if age_labels:
             patterns.append(ExtractionPattern(
                 "age",
@@ -401,7 +497,7 @@ class KVExtractionService:
         patterns = []
         
         # Case number (multilingual)
-        case_labels = self._build_multilingual_pattern("case_number", LEGAL_LABELS)
+        case_labels = self._build_multilingual_pattern("case_number", "legal")
         if case_labels:
             patterns.append(ExtractionPattern(
                 "case_number",
@@ -410,7 +506,7 @@ class KVExtractionService:
             ))
         
         # Court (multilingual)
-        court_labels = self._build_multilingual_pattern("court", LEGAL_LABELS)
+        court_labels = self._build_multilingual_pattern("court", "legal")
         if court_labels:
             patterns.append(ExtractionPattern(
                 "court_name",
@@ -419,7 +515,7 @@ class KVExtractionService:
             ))
         
         # Judge (multilingual)
-        judge_labels = self._build_multilingual_pattern("judge", LEGAL_LABELS)
+        judge_labels = self._build_multilingual_pattern("judge", "legal")
         if judge_labels:
             patterns.append(ExtractionPattern(
                 "judge_name",
@@ -428,7 +524,7 @@ class KVExtractionService:
             ))
         
         # Petitioner (multilingual)
-        pet_labels = self._build_multilingual_pattern("petitioner", LEGAL_LABELS)
+        pet_labels = self._build_multilingual_pattern("petitioner", "legal")
         if pet_labels:
             patterns.append(ExtractionPattern(
                 "petitioner",
@@ -437,7 +533,7 @@ class KVExtractionService:
             ))
         
         # Respondent (multilingual)
-        resp_labels = self._build_multilingual_pattern("respondent", LEGAL_LABELS)
+        resp_labels = self._build_multilingual_pattern("respondent", "legal")
         if resp_labels:
             patterns.append(ExtractionPattern(
                 "respondent",
@@ -446,7 +542,7 @@ class KVExtractionService:
             ))
         
         # Section (multilingual)
-        section_labels = self._build_multilingual_pattern("section", LEGAL_LABELS)
+        section_labels = self._build_multilingual_pattern("section", "legal")
         if section_labels:
             patterns.append(ExtractionPattern(
                 "section",
@@ -455,7 +551,7 @@ class KVExtractionService:
             ))
         
         # Police Station (multilingual)
-        ps_labels = self._build_multilingual_pattern("police_station", LEGAL_LABELS)
+        ps_labels = self._build_multilingual_pattern("police_station", "legal")
         if ps_labels:
             patterns.append(ExtractionPattern(
                 "police_station",
@@ -464,7 +560,7 @@ class KVExtractionService:
             ))
         
         # District (multilingual)
-        dist_labels = self._build_multilingual_pattern("district", LEGAL_LABELS)
+        dist_labels = self._build_multilingual_pattern("district", "legal")
         if dist_labels:
             patterns.append(ExtractionPattern(
                 "district",
@@ -473,7 +569,7 @@ class KVExtractionService:
             ))
         
         # State (multilingual)
-        state_labels = self._build_multilingual_pattern("state", LEGAL_LABELS)
+        state_labels = self._build_multilingual_pattern("state", "legal")
         if state_labels:
             patterns.append(ExtractionPattern(
                 "state",
@@ -482,7 +578,7 @@ class KVExtractionService:
             ))
         
         # FIR (multilingual)
-        fir_labels = self._build_multilingual_pattern("fir", LEGAL_LABELS)
+        fir_labels = self._build_multilingual_pattern("fir", "legal")
         if fir_labels:
             patterns.append(ExtractionPattern(
                 "fir_number",
@@ -504,6 +600,74 @@ class KVExtractionService:
         
         return patterns
     
+    def _build_prefilter(self, patterns: List[ExtractionPattern]):
+        """
+        Compile patterns into a Hyperscan database used as a prefilter.
+        
+        Hyperscan cannot return capture groups, so the database only reports
+        which patterns may match; values are still captured with `re`.
+        Returns None when Hyperscan is unavailable or compilation fails.
+        """
+        if not HYPERSCAN_AVAILABLE or not patterns:
+            return None
+        
+        base_flags = (
+            hyperscan.HS_FLAG_PREFILTER
+            | hyperscan.HS_FLAG_SINGLEMATCH
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_UCP
+        )
+        flags = []
+        for pattern in patterns:
+            hs_flags = base_flags
+            if pattern.flags & re.IGNORECASE:
+                hs_flags |= hyperscan.HS_FLAG_CASELESS
+            if pattern.flags & re.DOTALL:
+                hs_flags |= hyperscan.HS_FLAG_DOTALL
+            flags.append(hs_flags)
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[p.pattern.encode("utf-8") for p in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=flags,
+            )
+            return db
+        except Exception as e:
+            logger.warning(f"Hyperscan prefilter disabled: {e}")
+            return None
+    
+    def _candidate_patterns(
+        self,
+        patterns: List[ExtractionPattern],
+        prefilter,
+        text_bytes: Optional[bytes]
+    ) -> List[ExtractionPattern]:
+        """
+        Return only the patterns the prefilter reports as possibly matching.
+        
+        All patterns are returned when there is no prefilter or no UTF-8
+        encoding of the text to scan.
+        """
+        if prefilter is None or text_bytes is None:
+            return patterns
+        
+        hits = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(pattern_id)
+        
+        try:
+            # Single pass over the text for all patterns; releases the GIL
+            prefilter.scan(text_bytes, match_event_handler=on_match)
+        except Exception as e:
+            logger.debug(f"Hyperscan scan failed, using all patterns: {e}")
+            return patterns
+        
+        return [p for i, p in enumerate(patterns) if i in hits]
+    
     def extract_from_text(
         self,
         text: str,
@@ -522,17 +686,37 @@ class KVExtractionService:
         results = []
         seen_keys = set()
         
+        # Byte mode scans UTF-8 instead of the wider str representation;
+        # text with lone surrogates (broken OCR pairs) has no UTF-8 form
+        # and is matched as str
+        haystack = text
+        if self.use_bytes_regex:
+            try:
+                haystack = text.encode("utf-8")
+            except UnicodeEncodeError:
+                pass
+        text_bytes = haystack if isinstance(haystack, bytes) else None
+        if text_bytes is None and HYPERSCAN_AVAILABLE:
+            try:
+                text_bytes = text.encode("utf-8")
+            except UnicodeEncodeError:
+                pass
+        
         # Apply default patterns
-        for pattern in self.patterns:
-            kv = self._apply_pattern(pattern, text)
+        patterns = self._candidate_patterns(self.patterns, self._prefilter, text_bytes)
+        for pattern in patterns:
+            kv = self._apply_pattern(pattern, haystack)
             if kv and pattern.key_name not in seen_keys:
                 results.append(kv)
                 seen_keys.add(pattern.key_name)
         
         # Apply legal patterns if requested
         if include_legal:
-            for pattern in self.legal_patterns:
-                kv = self._apply_pattern(pattern, text)
+            legal_patterns = self._candidate_patterns(
+                self.legal_patterns, self._legal_prefilter, text_bytes
+            )
+            for pattern in legal_patterns:
+                kv = self._apply_pattern(pattern, haystack)
                 if kv and pattern.key_name not in seen_keys:
                     results.append(kv)
                     seen_keys.add(pattern.key_name)
@@ -546,14 +730,31 @@ class KVExtractionService:
         
         return results
     
-    def _apply_pattern(self, pattern: ExtractionPattern, text: str) -> Optional[KeyValuePair]:
-        """Apply a single pattern to extract key-value pair."""
+    def _apply_pattern(
+        self,
+        pattern: ExtractionPattern,
+        text: str | bytes
+    ) -> Optional[KeyValuePair]:
+        """
+        Apply a single pattern to extract key-value pair.
+        
+        Args:
+            pattern: Compiled extraction pattern
+            text: Text to search, or its UTF-8 encoding in byte mode
+        """
         try:
-            match = re.search(pattern.pattern, text, pattern.flags)
+            if isinstance(text, bytes):
+                match = pattern.byte_regex.search(text)
+            else:
+                match = pattern.regex.search(text)
             if match:
-                value = match.group(1).strip() if match.lastindex else match.group(0).strip()
+                value = match.group(1) if match.lastindex else match.group(0)
+                if isinstance(value, bytes):
+                    # Length-bounded byte patterns may cut a multi-byte character
+                    value = value.decode("utf-8", errors="ignore")
+                value = value.strip()
                 # Clean up value
-                value = re.sub(r'\s+', ' ', value)
+                value = _WHITESPACE_RE.sub(' ', value)
                 value = value.strip('.,;:।')  # Include Hindi danda
                 
                 if value and len(value) > 1:
@@ -571,11 +772,7 @@ class KVExtractionService:
         """Extract key:value pairs from text (supports Indian scripts and punctuation)."""
         results = []
         
-        # Pattern: Key: Value (supports Devanagari danda ।, colon, etc.)
-        # Supports: Latin, Devanagari, Bengali, Telugu, Tamil, Kannada, Malayalam, Gujarati, Punjabi, Odia scripts
-        pattern = r'^([A-Za-z\u0900-\u097F\u0980-\u09FF\u0A00-\u0A7F\u0A80-\u0AFF\u0B00-\u0B7F\u0B80-\u0BFF\u0C00-\u0C7F\u0C80-\u0CFF\u0D00-\u0D7F][^\n:।]{1,50})\s*[:।]\s*(.+?)$'
-        
-        for match in re.finditer(pattern, text, re.MULTILINE):
+        for match in _COLON_PAIR_RE.finditer(text):
             key = match.group(1).strip()
             value = match.group(2).strip()
             
@@ -638,20 +835,22 @@ class KVExtractionService:
         text = text.strip()
         
         # Ends with colon or Hindi danda
-        if text.endswith(':') or text.endswith('।'):
+        if text and text[-1] in _LABEL_END_CHARS:
             return len(text) < 60
         
         # Is uppercase and short (for English)
         if text.isupper() and 2 < len(text) < 40:
             return True
         
-        # Check against all multilingual labels
+        # Exact label match (common case) is a single hash lookup
         text_lower = text.lower()
-        for field, langs in {**self.multilingual_labels, **self.legal_labels}.items():
-            for lang, labels in langs.items():
-                for label in labels:
-                    if label.lower() in text_lower or text_lower in label.lower():
-                        return True
+        if text_lower in self._all_labels_lower:
+            return True
+        
+        # Fall back to substring matching against all multilingual labels
+        for label in self._all_labels_lower:
+            if label in text_lower or text_lower in label:
+                return True
         
         return False
     
@@ -1,5 +1,7 @@
 """Document AI Parser - Layout Detection Service"""
 import logging
+import re
+import string
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -10,6 +12,48 @@ from app.models.document import BoundingBox, ContentType
 
 logger = logging.getLogger(__name__)
 
+# Common header prefixes, matched case-insensitively at the start of a block
+_HEADER_RE = re.compile(
+    r"CHAPTER|SECTION|ARTICLE|PART|ORDER|JUDGMENT|PETITION|PRAYER"
+    r"|अध्याय|धारा|खंड",  # Hindi
+    re.IGNORECASE
+)
+
+# Prefixes of numbered section headers and of list items
+_NUMBERED_HEADER_PREFIXES = tuple(
+    prefix for i in range(1, 100) for prefix in (f"{i}.", f"{i})")
+)
+_LIST_ITEM_PREFIXES = (
+    ("•", "-", "–", "—", "*", "○", "●")
+    + tuple(
+        prefix for i in range(1, 100) for prefix in (f"{i}.", f"({i})", f"{i})")
+    )
+    + tuple(
+        prefix for c in string.ascii_letters for prefix in (f"{c}.", f"({c})", f"{c})")
+    )
+)
+
+# Prefix table: each prefix maps to a bitmask of the kinds it starts, so a
+# block is classified with one dict lookup per prefix length rather than
+# testing every prefix in turn
+_PREFIX_NUMBERED_HEADER = 1
+_PREFIX_LIST_ITEM = 2
+_PREFIX_KINDS: Dict[str, int] = {}
+for _prefix in _NUMBERED_HEADER_PREFIXES:
+    _PREFIX_KINDS[_prefix] = _PREFIX_KINDS.get(_prefix, 0) | _PREFIX_NUMBERED_HEADER
+for _prefix in _LIST_ITEM_PREFIXES:
+    _PREFIX_KINDS[_prefix] = _PREFIX_KINDS.get(_prefix, 0) | _PREFIX_LIST_ITEM
+del _prefix
+_PREFIX_LENGTHS = tuple(sorted({len(prefix) for prefix in _PREFIX_KINDS}))
+
+
+def _prefix_kinds(text: str) -> int:
+    """Return the bitmask of prefix kinds `text` starts with."""
+    kinds = 0
+    for length in _PREFIX_LENGTHS:
+        kinds |= _PREFIX_KINDS.get(text[:length], 0)
+    return kinds
+
 
 class LayoutType(str, Enum):
     """Types of layout elements detected."""
@@ -23,7 +67,7 @@ class LayoutType(str, Enum):
     SECTION_HEADER = "section_header"
 
 
-@dataclass
+@dataclass(slots=True)
 class LayoutElement:
     """Detected layout element."""
     element_type: LayoutType
@@ -66,16 +110,24 @@ class LayoutService:
         
         layout_elements = []
         
-        for idx, block in enumerate(text_blocks):
+        # Walk each bounding box once; classification and reading order
+        # both work from this (N, 4) array of [x, y, width, height]
+        bboxes = np.array(
+            [
+                (bbox.x, bbox.y, bbox.width, bbox.height)
+                for bbox in (block["bounding_box"] for block in text_blocks)
+            ],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        
+        # Classify based on position and characteristics
+        element_types = self._classify_elements(text_blocks, bboxes, page_height)
+        
+        for idx, (block, element_type) in enumerate(zip(text_blocks, element_types)):
             bbox = block["bounding_box"]
             text = block["text"]
             confidence = block["confidence"]
             
-            # Classify based on position and characteristics
-            element_type = self._classify_element(
-                text, bbox, page_width, page_height, idx, len(text_blocks)
-            )
-            
             layout_elements.append(LayoutElement(
                 element_type=element_type,
                 bounding_box=bbox,
@@ -84,8 +136,10 @@ class LayoutService:
                 order=idx
             ))
         
-        # Sort by reading order (top to bottom, left to right)
-        layout_elements.sort(key=lambda e: (e.bounding_box.y, e.bounding_box.x))
+        # Sort by reading order (top to bottom, left to right); lexsort is
+        # stable and orders by the last key first, i.e. y then x
+        order = np.lexsort((bboxes[:, 0], bboxes[:, 1]))
+        layout_elements = [layout_elements[i] for i in order]
         
         # Update order after sorting
         for idx, elem in enumerate(layout_elements):
@@ -93,31 +147,51 @@ class LayoutService:
         
         return layout_elements
     
-    def _classify_element(
+    def _classify_elements(
         self,
-        text: str,
-        bbox: BoundingBox,
-        page_width: float,
-        page_height: float,
-        block_idx: int,
-        total_blocks: int
-    ) -> LayoutType:
-        """Classify a text block based on heuristics."""
-        
-        # Check if header (top 10% of page)
-        if bbox.y < page_height * 0.10:
-            if len(text) < 100:
-                return LayoutType.HEADER
-        
-        # Check if footer (bottom 10% of page)
-        if bbox.y + bbox.height > page_height * 0.90:
-            if len(text) < 100:
-                return LayoutType.FOOTER
-        
-        # Check if title (large text, usually at top, short)
-        if block_idx < 5 and len(text) < 150:
-            if bbox.height > page_height * 0.03:  # Larger than average text
-                return LayoutType.TITLE
+        text_blocks: List[Dict[str, Any]],
+        bboxes: np.ndarray,
+        page_height: float
+    ) -> List[LayoutType]:
+        """
+        Classify all text blocks of a page based on heuristics.
+        
+        The geometric tests are evaluated as NumPy masks over every block at
+        once (`bboxes` holds one [x, y, width, height] row per block); only
+        blocks no mask claims go through the text-based checks.
+        """
+        n = len(text_blocks)
+        # Pixel coordinates fit float32, which halves the bytes each mask
+        # kernel streams; thresholds are cast too so comparisons stay float32
+        ys = bboxes[:, 1].astype(np.float32)
+        hs = bboxes[:, 3].astype(np.float32)
+        lengths = np.fromiter((len(b["text"]) for b in text_blocks), dtype=np.int64, count=n)
+        short = lengths < 100
+        
+        # Header (top 10% of page) / footer (bottom 10% of page)
+        is_header = (ys < np.float32(page_height * 0.10)) & short
+        is_footer = ((ys + hs) > np.float32(page_height * 0.90)) & short
+        
+        # Title (large text, usually at top, short)
+        is_title = (np.arange(n) < 5) & (lengths < 150) & (hs > np.float32(page_height * 0.03))
+        
+        element_types = []
+        for block, header, footer, title in zip(
+            text_blocks, is_header.tolist(), is_footer.tolist(), is_title.tolist()
+        ):
+            if header:
+                element_types.append(LayoutType.HEADER)
+            elif footer:
+                element_types.append(LayoutType.FOOTER)
+            elif title:
+                element_types.append(LayoutType.TITLE)
+            else:
+                element_types.append(self._classify_text(block["text"]))
+        
+        return element_types
+    
+    def _classify_text(self, text: str) -> LayoutType:
+        """Classify a text block that no positional heuristic matched."""
         
         # Check if section header
         if self._is_section_header(text):
@@ -135,20 +209,13 @@ class LayoutService:
         text = text.strip()
         
         # Numbered sections
-        if any(text.startswith(f"{i}.") or text.startswith(f"{i})") for i in range(1, 100)):
+        if _prefix_kinds(text) & _PREFIX_NUMBERED_HEADER:
             if len(text) < 100 and text.isupper() or text.istitle():
                 return True
         
         # Common header patterns
-        header_patterns = [
-            "CHAPTER", "SECTION", "ARTICLE", "PART",
-            "ORDER", "JUDGMENT", "PETITION", "PRAYER",
-            "अध्याय", "धारा", "खंड",  # Hindi
-        ]
-        
-        for pattern in header_patterns:
-            if text.upper().startswith(pattern):
-                return True
+        if _HEADER_RE.match(text):
+            return True
         
         # Short uppercase text
         if len(text) < 80 and text.isupper():
@@ -160,21 +227,8 @@ class LayoutService:
         """Check if text is a list item."""
         text = text.strip()
         
-        # Bullet points
-        if text.startswith(("•", "-", "–", "—", "*", "○", "●")):
-            return True
-        
-        # Numbered lists
-        if any(text.startswith(f"{i}.") or text.startswith(f"({i})") or text.startswith(f"{i})") 
-               for i in range(1, 100)):
-            return True
-        
-        # Lettered lists
-        if any(text.startswith(f"{c}.") or text.startswith(f"({c})") or text.startswith(f"{c})")
-               for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"):
-            return True
-        
-        return False
+        # Bullet points, numbered lists and lettered lists
+        return bool(_prefix_kinds(text) & _PREFIX_LIST_ITEM)
     
     def detect_tables_regions(
         self,
@@ -1,17 +1,37 @@
 """Document AI Parser - PDF Metadata & Embedded Data Extraction Service"""
 import logging
+import multiprocessing
 import re
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 
 import fitz  # PyMuPDF
+import numpy as np
+
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Link type for each URI scheme handled specially; anything else is "other"
+_LINK_SCHEME_TYPES = {
+    "mailto": "email",
+    "tel": "phone",
+    "http": "uri",
+    "https": "uri",
+}
+
+# Deletion table for phone normalization: '-' plus every character `\s`
+# matches in PHONE_PATTERN (all Unicode whitespace lies below U+3001)
+_PHONE_STRIP = str.maketrans("", "", "-" + "".join(
+    c for c in map(chr, range(0x3001)) if c.isspace()
+))
 
-@dataclass
+
+@dataclass(slots=True)
 class EmbeddedLink:
     """Embedded hyperlink in PDF."""
     url: str
@@ -21,7 +41,7 @@ class EmbeddedLink:
     rect: Optional[Dict[str, float]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddedEmail:
     """Embedded email address."""
     email: str
@@ -30,7 +50,7 @@ class EmbeddedEmail:
     context: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PDFAnnotation:
     """PDF annotation/comment."""
     annotation_type: str
@@ -41,7 +61,7 @@ class PDFAnnotation:
     rect: Optional[Dict[str, float]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PDFMetadata:
     """Full PDF metadata."""
     title: Optional[str] = None
@@ -59,7 +79,7 @@ class PDFMetadata:
     has_toc: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddedData:
     """All embedded data extracted from PDF."""
     metadata: PDFMetadata
@@ -89,22 +109,32 @@ class PDFMetadataService:
     - Image information
     """
     
-    # Regex patterns
+    # Regex patterns; character classes spell out both cases, so none of
+    # them need re.IGNORECASE
     EMAIL_PATTERN = re.compile(
-        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-        re.IGNORECASE
+        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
     )
     
     PHONE_PATTERN = re.compile(
-        r'(?:\+91[\s-]?)?(?:\d{5}[\s-]?\d{5}|\d{10}|\d{4}[\s-]?\d{3}[\s-]?\d{3}|\d{3}[\s-]?\d{3}[\s-]?\d{4})',
-        re.IGNORECASE
+        r'(?:\+91[\s-]?)?(?:\d{5}[\s-]?\d{5}|\d{10}|\d{4}[\s-]?\d{3}[\s-]?\d{3}|\d{3}[\s-]?\d{3}[\s-]?\d{4})'
     )
     
     URL_PATTERN = re.compile(
-        r'https?://[^\s<>"{}|\\^`\[\]]+',
-        re.IGNORECASE
+        r'[Hh][Tt][Tt][Pp][Ss]?://[^\s<>"{}|\\^`\[\]]+'
     )
     
+    # Single-pass alternation over page text; match.lastgroup names the kind
+    CONTACTS_PATTERN = re.compile(
+        rf'(?P<email>{EMAIL_PATTERN.pattern})'
+        rf'|(?P<url>{URL_PATTERN.pattern})'
+        rf'|(?P<phone>{PHONE_PATTERN.pattern})'
+    )
+    
+    def __init__(self):
+        settings = get_settings()
+        self.pdf_workers = settings.pdf_workers
+        self.pdf_parallel_min_pages = settings.pdf_parallel_min_pages
+    
     def extract_all(self, pdf_path: str | Path) -> EmbeddedData:
         """
         Extract all embedded data from a PDF.
@@ -124,17 +154,28 @@ class PDFMetadataService:
             return EmbeddedData(metadata=PDFMetadata())
         
         try:
+            # Read the outline once; metadata and the TOC both use it
+            raw_toc = doc.get_toc()
+            
             # Extract metadata
-            metadata = self._extract_metadata(doc, pdf_path)
+            metadata = self._extract_metadata(doc, pdf_path, raw_toc)
             
-            # Extract links, emails, phones
-            links, emails, phones = self._extract_links_and_contacts(doc)
+            # Extract links, emails, phones and annotations; large documents
+            # are scanned in worker processes when configured
+            page_count = len(doc)
+            scanned = None
+            if self.pdf_workers > 1 and page_count >= self.pdf_parallel_min_pages:
+                scanned = self._scan_pages_parallel(pdf_path, page_count)
             
-            # Extract annotations
-            annotations = self._extract_annotations(doc)
+            if scanned is not None:
+                page_hits, annotations = scanned
+                links, emails, phones = self._extract_links_and_contacts(doc, page_hits)
+            else:
+                links, emails, phones = self._extract_links_and_contacts(doc)
+                annotations = self._extract_annotations(doc)
             
             # Extract TOC
-            toc = self._extract_toc(doc)
+            toc = self._extract_toc(raw_toc)
             
             # Extract form fields
             form_fields = self._extract_form_fields(doc)
@@ -156,7 +197,12 @@ class PDFMetadataService:
         finally:
             doc.close()
     
-    def _extract_metadata(self, doc: fitz.Document, pdf_path: Path) -> PDFMetadata:
+    def _extract_metadata(
+        self,
+        doc: fitz.Document,
+        pdf_path: Path,
+        raw_toc: List[list]
+    ) -> PDFMetadata:
         """Extract PDF document metadata."""
         meta = doc.metadata
         
@@ -182,11 +228,17 @@ class PDFMetadataService:
             file_size_bytes=pdf_path.stat().st_size if pdf_path.exists() else 0,
             is_encrypted=doc.is_encrypted,
             has_forms=doc.is_form_pdf,
-            has_toc=len(doc.get_toc()) > 0,
+            has_toc=bool(raw_toc),
         )
     
-    def _parse_pdf_date(self, date_str: str) -> Optional[datetime]:
-        """Parse PDF date string (D:YYYYMMDDHHmmSS format)."""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_pdf_date(date_str: str) -> Optional[datetime]:
+        """
+        Parse PDF date string (D:YYYYMMDDHHmmSS format).
+        
+        Memoized: annotations created in one batch share the same timestamp.
+        """
         try:
             if date_str.startswith("D:"):
                 date_str = date_str[2:]
@@ -197,201 +249,334 @@ class PDFMetadataService:
             return None
     
     def _extract_links_and_contacts(
-        self, doc: fitz.Document
+        self,
+        doc: fitz.Document,
+        page_hits: Optional[Iterable[Tuple[int, List[tuple], List[tuple]]]] = None
     ) -> tuple[List[EmbeddedLink], List[EmbeddedEmail], List[Dict]]:
-        """Extract hyperlinks, email addresses, and phone numbers."""
+        """
+        Extract hyperlinks, email addresses, and phone numbers.
+        
+        Args:
+            doc: Open PDF document
+            page_hits: Per-page results of `_collect_page_contacts` in page
+                order (e.g. from worker processes); collected from `doc`
+                when omitted
+        """
+        if page_hits is None:
+            page_hits = (
+                self._collect_page_contacts(page, page_num)
+                for page_num, page in enumerate(doc, start=1)
+            )
+        
         links = []
         emails = []
         phones = []
-        seen_emails = set()
-        seen_phones = set()
-        seen_urls = set()
+        # One set of (kind, value) keys dedups emails, phones and URLs alike
+        seen = set()
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_number = page_num + 1
+        for page_number, link_hits, text_hits in page_hits:
+            # Build page-local results and extend the totals once per page
+            page_links = []
+            page_emails = []
+            page_phones = []
             
-            # Extract links from PDF link annotations
-            for link in page.get_links():
-                link_type = link.get("kind", 0)
-                uri = link.get("uri", "")
-                
-                # Get text at link location
-                rect = link.get("from")
-                link_text = None
-                if rect:
-                    try:
-                        link_text = page.get_text("text", clip=rect).strip()
-                    except:
-                        pass
+            # Links from PDF link annotations
+            for uri_kind, uri, value, link_text, rect_dict in link_hits:
+                # Email link
+                if uri_kind == "email":
+                    if value and (key := ("email", value)) not in seen:
+                        seen.add(key)
+                        page_emails.append(EmbeddedEmail(
+                            email=value,
+                            source="link",
+                            page_number=page_number,
+                            context=link_text
+                        ))
+                        page_links.append(EmbeddedLink(
+                            url=uri,
+                            link_type="email",
+                            page_number=page_number,
+                            text=link_text,
+                            rect=rect_dict
+                        ))
                 
-                rect_dict = None
-                if rect:
-                    rect_dict = {
-                        "x": rect.x0,
-                        "y": rect.y0,
-                        "width": rect.x1 - rect.x0,
-                        "height": rect.y1 - rect.y0,
-                    }
+                # Phone link
+                elif uri_kind == "phone":
+                    if value and (key := ("phone", value)) not in seen:
+                        seen.add(key)
+                        page_phones.append({
+                            "number": value,
+                            "source": "link",
+                            "page_number": page_number,
+                            "context": link_text
+                        })
+                        page_links.append(EmbeddedLink(
+                            url=uri,
+                            link_type="phone",
+                            page_number=page_number,
+                            text=link_text,
+                            rect=rect_dict
+                        ))
                 
-                if uri:
-                    # Email link
-                    if uri.startswith("mailto:"):
-                        email = uri[7:].split("?")[0]  # Remove mailto: and query params
-                        if email and email not in seen_emails:
-                            seen_emails.add(email)
-                            emails.append(EmbeddedEmail(
-                                email=email,
-                                source="link",
-                                page_number=page_number,
-                                context=link_text
-                            ))
-                            links.append(EmbeddedLink(
-                                url=uri,
-                                link_type="email",
-                                page_number=page_number,
-                                text=link_text,
-                                rect=rect_dict
-                            ))
-                    
-                    # Phone link
-                    elif uri.startswith("tel:"):
-                        phone = uri[4:]
-                        if phone and phone not in seen_phones:
-                            seen_phones.add(phone)
-                            phones.append({
-                                "number": phone,
-                                "source": "link",
-                                "page_number": page_number,
-                                "context": link_text
-                            })
-                            links.append(EmbeddedLink(
-                                url=uri,
-                                link_type="phone",
-                                page_number=page_number,
-                                text=link_text,
-                                rect=rect_dict
-                            ))
-                    
-                    # Regular URL
-                    elif uri.startswith(("http://", "https://")):
-                        if uri not in seen_urls:
-                            seen_urls.add(uri)
-                            links.append(EmbeddedLink(
-                                url=uri,
-                                link_type="uri",
-                                page_number=page_number,
-                                text=link_text,
-                                rect=rect_dict
-                            ))
-                    
-                    # Other links (internal, file, etc.)
-                    else:
-                        links.append(EmbeddedLink(
+                # Regular URL
+                elif uri_kind == "uri":
+                    if (key := ("uri", uri)) not in seen:
+                        seen.add(key)
+                        page_links.append(EmbeddedLink(
                             url=uri,
-                            link_type="other",
+                            link_type="uri",
                             page_number=page_number,
                             text=link_text,
                             rect=rect_dict
                         ))
-            
-            # Extract emails and phones from page text
-            page_text = page.get_text("text")
-            
-            # Find emails in text
-            for match in self.EMAIL_PATTERN.finditer(page_text):
-                email = match.group(0)
-                if email not in seen_emails:
-                    seen_emails.add(email)
-                    # Get surrounding context
-                    start = max(0, match.start() - 30)
-                    end = min(len(page_text), match.end() + 30)
-                    context = page_text[start:end].strip()
-                    
-                    emails.append(EmbeddedEmail(
-                        email=email,
-                        source="text",
+                
+                # Other links (internal, file, etc.)
+                else:
+                    page_links.append(EmbeddedLink(
+                        url=uri,
+                        link_type="other",
                         page_number=page_number,
-                        context=context
+                        text=link_text,
+                        rect=rect_dict
                     ))
             
-            # Find phone numbers in text
-            for match in self.PHONE_PATTERN.finditer(page_text):
-                phone = match.group(0)
-                normalized = re.sub(r'[\s-]', '', phone)
-                if len(normalized) >= 10 and normalized not in seen_phones:
-                    seen_phones.add(normalized)
-                    start = max(0, match.start() - 30)
-                    end = min(len(page_text), match.end() + 30)
-                    context = page_text[start:end].strip()
-                    
-                    phones.append({
-                        "number": phone,
-                        "normalized": normalized,
-                        "source": "text",
-                        "page_number": page_number,
-                        "context": context
-                    })
-            
-            # Find URLs in text that might not be links
-            for match in self.URL_PATTERN.finditer(page_text):
-                url = match.group(0)
-                if url not in seen_urls:
-                    seen_urls.add(url)
-                    links.append(EmbeddedLink(
-                        url=url,
+            # Emails, phone numbers and URLs (that might not be links) in text
+            for kind, value, context in text_hits:
+                if kind == "email":
+                    if (key := ("email", value)) not in seen:
+                        seen.add(key)
+                        page_emails.append(EmbeddedEmail(
+                            email=value,
+                            source="text",
+                            page_number=page_number,
+                            context=context
+                        ))
+                
+                elif kind == "phone":
+                    normalized = value.translate(_PHONE_STRIP)
+                    if len(normalized) >= 10 and (key := ("phone", normalized)) not in seen:
+                        seen.add(key)
+                        page_phones.append({
+                            "number": value,
+                            "normalized": normalized,
+                            "source": "text",
+                            "page_number": page_number,
+                            "context": context
+                        })
+                
+                elif (key := ("uri", value)) not in seen:
+                    seen.add(key)
+                    page_links.append(EmbeddedLink(
+                        url=value,
                         link_type="uri",
                         page_number=page_number,
                         text=None,
                         rect=None
                     ))
+            
+            links.extend(page_links)
+            emails.extend(page_emails)
+            phones.extend(page_phones)
         
         return links, emails, phones
     
-    def _extract_annotations(self, doc: fitz.Document) -> List[PDFAnnotation]:
-        """Extract PDF annotations/comments."""
-        annotations = []
+    def _collect_page_contacts(
+        self, page: fitz.Page, page_number: int
+    ) -> Tuple[int, List[tuple], List[tuple]]:
+        """
+        Collect link and text contact hits on one page, before deduplication.
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        Returns (page_number, link_hits, text_hits) where link hits are
+        (uri_kind, uri, email/phone value, link_text, rect_dict) and text hits
+        are (kind, value, context).
+        """
+        link_hits = []
+        text_hits = []
+        words = None  # Page words, extracted once on the first link with a rect
+        
+        # Extract links from PDF link annotations
+        for link in page.get_links():
+            uri = link.get("uri", "")
+            if not uri:
+                continue
             
-            for annot in page.annots() or []:
-                annot_type = annot.type[1] if annot.type else "Unknown"
-                
-                # Get annotation content
-                content = annot.info.get("content", "") or ""
-                
-                # Skip if no content
-                if not content.strip():
-                    continue
-                
-                rect = annot.rect
+            # Get text at link location
+            rect = link.get("from")
+            link_text = None
+            if rect:
+                try:
+                    if words is None:
+                        words = self._get_page_words(page)
+                    link_text = self._words_in_rect(words, rect)
+                except:
+                    pass
+            
+            rect_dict = None
+            if rect:
                 rect_dict = {
                     "x": rect.x0,
                     "y": rect.y0,
                     "width": rect.x1 - rect.x0,
                     "height": rect.y1 - rect.y0,
-                } if rect else None
-                
-                # Parse creation date
-                created = None
-                if annot.info.get("creationDate"):
-                    created = self._parse_pdf_date(annot.info["creationDate"])
-                
-                annotations.append(PDFAnnotation(
-                    annotation_type=annot_type,
-                    content=content,
-                    page_number=page_num + 1,
-                    author=annot.info.get("title"),  # 'title' is often author in annotations
-                    created=created,
-                    rect=rect_dict
-                ))
+                }
+            
+            # Dispatch once on the (case-insensitive) URI scheme
+            colon = uri.find(":")
+            uri_kind = _LINK_SCHEME_TYPES.get(uri[:colon].lower(), "other") if colon > 0 else "other"
+            
+            value = None
+            if uri_kind == "email":
+                value = uri[colon + 1:].split("?")[0]  # Remove mailto: and query params
+            elif uri_kind == "phone":
+                value = uri[colon + 1:]
+            
+            link_hits.append((uri_kind, uri, value, link_text, rect_dict))
+        
+        # Find emails, phone numbers and URLs in a single pass over the page text
+        page_text = page.get_text("text")
+        
+        for match in self.CONTACTS_PATTERN.finditer(page_text):
+            kind = match.lastgroup
+            context = None
+            if kind != "url":
+                # Get surrounding context
+                start = max(0, match.start() - 30)
+                end = min(len(page_text), match.end() + 30)
+                context = page_text[start:end].strip()
+            
+            text_hits.append((kind, match.group(0), context))
+        
+        return page_number, link_hits, text_hits
+    
+    def _get_page_words(self, page: fitz.Page) -> Tuple[List[tuple], np.ndarray]:
+        """
+        Extract page words once, with their boxes packed as an (N, 4) array.
+        
+        Boxes use small glyph heights (font size rather than line height), so
+        on tightly leaded text a link rect does not reach into the lines
+        above and below it. The global setting is restored afterwards.
+        """
+        small_glyph_heights = fitz.TOOLS.set_small_glyph_heights()
+        fitz.TOOLS.set_small_glyph_heights(True)
+        try:
+            word_list = page.get_text("words")
+        finally:
+            fitz.TOOLS.set_small_glyph_heights(small_glyph_heights)
+        boxes = np.array([w[:4] for w in word_list], dtype=np.float64).reshape(-1, 4)
+        return word_list, boxes
+    
+    def _words_in_rect(self, words: Tuple[List[tuple], np.ndarray], rect: fitz.Rect) -> str:
+        """Join the words whose boxes intersect `rect`, one output line per text line."""
+        word_list, boxes = words
+        mask = (
+            (boxes[:, 0] < rect.x1) & (boxes[:, 2] > rect.x0)
+            & (boxes[:, 1] < rect.y1) & (boxes[:, 3] > rect.y0)
+        )
+        
+        lines = []
+        line_key = None
+        for idx in np.flatnonzero(mask):
+            word = word_list[idx]
+            # Words are (x0, y0, x1, y1, text, block_no, line_no, word_no)
+            if (word[5], word[6]) != line_key:
+                line_key = (word[5], word[6])
+                lines.append([])
+            lines[-1].append(word[4])
+        
+        return "\n".join(" ".join(line) for line in lines)
+    
+    def _extract_annotations(self, doc: fitz.Document) -> List[PDFAnnotation]:
+        """Extract PDF annotations/comments."""
+        annotations = []
+        
+        for page_num, page in enumerate(doc, start=1):
+            annotations.extend(self._collect_page_annotations(page, page_num))
+        
+        return annotations
+    
+    def _collect_page_annotations(
+        self, page: fitz.Page, page_number: int
+    ) -> List[PDFAnnotation]:
+        """Extract annotations/comments from one page."""
+        annotations = []
+        
+        # Cheap probe: most pages carry no annotations at all
+        if page.first_annot is None:
+            return annotations
+        
+        for annot in page.annots() or []:
+            annot_type = annot.type[1] if annot.type else "Unknown"
+            
+            # annot.info builds a new dict on every access; read it once
+            info = annot.info
+            
+            # Get annotation content
+            content = info.get("content", "") or ""
+            
+            # Skip if no content
+            if not content.strip():
+                continue
+            
+            rect = annot.rect
+            rect_dict = {
+                "x": rect.x0,
+                "y": rect.y0,
+                "width": rect.x1 - rect.x0,
+                "height": rect.y1 - rect.y0,
+            } if rect else None
+            
+            # Parse creation date
+            created = None
+            if info.get("creationDate"):
+                created = self._parse_pdf_date(info["creationDate"])
+            
+            annotations.append(PDFAnnotation(
+                annotation_type=annot_type,
+                content=content,
+                page_number=page_number,
+                author=info.get("title"),  # 'title' is often author in annotations
+                created=created,
+                rect=rect_dict
+            ))
         
         return annotations
     
-    def _extract_toc(self, doc: fitz.Document) -> List[Dict[str, Any]]:
-        """Extract table of contents."""
-        toc = doc.get_toc()
+    def _scan_pages_parallel(
+        self, pdf_path: Path, page_count: int
+    ) -> Optional[Tuple[List[tuple], List[PDFAnnotation]]]:
+        """
+        Collect contacts and annotations for all pages in worker processes.
+        
+        PyMuPDF is not thread-safe, so each worker opens its own copy of the
+        document and scans a contiguous page range. Returns None if the pool
+        fails, so the caller can fall back to the serial path.
+        """
+        workers = min(self.pdf_workers, page_count)
+        step = -(-page_count // workers)  # Ceiling division
+        starts = list(range(0, page_count, step))
+        stops = [min(start + step, page_count) for start in starts]
+        
+        page_hits = []
+        annotations = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=len(starts),
+                mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                for range_result in executor.map(
+                    _scan_page_range, [str(pdf_path)] * len(starts), starts, stops
+                ):
+                    for contacts, page_annotations in range_result:
+                        page_hits.append(contacts)
+                        annotations.extend(page_annotations)
+        except Exception as e:
+            logger.warning(f"Parallel PDF page scan failed, scanning serially: {e}")
+            return None
+        
+        return page_hits, annotations
+    
+    def _extract_toc(self, toc: List[list]) -> List[Dict[str, Any]]:
+        """Build table of contents entries from `doc.get_toc()` output."""
         return [
             {
                 "level": item[0],
@@ -408,15 +593,13 @@ class PDFMetadataService:
         if not doc.is_form_pdf:
             return form_fields
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            
+        for page_num, page in enumerate(doc, start=1):
             for widget in page.widgets() or []:
                 field = {
                     "name": widget.field_name,
                     "type": widget.field_type_string,
                     "value": widget.field_value,
-                    "page_number": page_num + 1,
+                    "page_number": page_num,
                 }
                 
                 # Add additional info for specific types
@@ -431,26 +614,18 @@ class PDFMetadataService:
     
     def _extract_images_info(self, doc: fitz.Document) -> List[Dict[str, Any]]:
         """Extract information about embedded images."""
-        images_info = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            
-            for img_index, img in enumerate(page.get_images(full=True)):
-                xref = img[0]
-                width = img[2]
-                height = img[3]
-                
-                images_info.append({
-                    "page_number": page_num + 1,
-                    "image_index": img_index,
-                    "xref": xref,
-                    "width": width,
-                    "height": height,
-                    "colorspace": img[4],
-                })
-        
-        return images_info
+        return [
+            {
+                "page_number": page_num,
+                "image_index": img_index,
+                "xref": img[0],
+                "width": img[2],
+                "height": img[3],
+                "colorspace": img[4],
+            }
+            for page_num, page in enumerate(doc, start=1)
+            for img_index, img in enumerate(page.get_images(full=True))
+        ]
     
     def extract_to_dict(self, pdf_path: str | Path) -> Dict[str, Any]:
         """Extract all data and return as dictionary."""
@@ -508,6 +683,24 @@ class PDFMetadataService:
         }
 
 
+def _scan_page_range(
+    pdf_path: str, start: int, stop: int
+) -> List[Tuple[tuple, List[PDFAnnotation]]]:
+    """Process-pool worker: collect contacts and annotations for pages [start, stop)."""
+    service = PDFMetadataService()
+    doc = fitz.open(pdf_path)
+    try:
+        return [
+            (
+                service._collect_page_contacts(page, page_num),
+                service._collect_page_annotations(page, page_num),
+            )
+            for page_num, page in enumerate(doc.pages(start, stop), start=start + 1)
+        ]
+    finally:
+        doc.close()
+
+
 # Singleton instance
 _pdf_metadata_service: Optional[PDFMetadataService] = None
 
@@ -1,17 +1,32 @@
 """Document AI Parser - OCR Service using PaddleOCR with Full Indian Language Support"""
+import gc
 import logging
-from typing import List, Dict, Any, Tuple, Optional
+import string
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Dict, Any, Mapping, Tuple, Optional
 from pathlib import Path
 import numpy as np
 from PIL import Image
 
-from paddleocr import PaddleOCR
-
 from app.config import get_settings
 from app.models.document import BoundingBox
 
+if TYPE_CHECKING:
+    from paddleocr import PaddleOCR
+
 logger = logging.getLogger(__name__)
 
+# Try to import numba - it's optional (native script counting kernel)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 # ============================================================================
 # INDIAN LANGUAGE SUPPORT - PaddleOCR Language Codes & Fallbacks
@@ -49,6 +64,36 @@ PADDLEOCR_LANGUAGES = {
     "brx": "hi",         # Bodo -> Hindi (Devanagari)
 }
 
+# Supported languages with their status, built once; entries are read-only
+# views since every caller shares them
+SUPPORTED_LANGUAGES: Tuple[Mapping[str, str], ...] = tuple(
+    MappingProxyType(language) for language in (
+        {"code": "en", "name": "English", "status": "full"},
+        {"code": "hi", "name": "Hindi", "status": "full"},
+        {"code": "bn", "name": "Bengali", "status": "full"},
+        {"code": "te", "name": "Telugu", "status": "full"},
+        {"code": "mr", "name": "Marathi", "status": "full"},
+        {"code": "ta", "name": "Tamil", "status": "full"},
+        {"code": "gu", "name": "Gujarati", "status": "full"},
+        {"code": "kn", "name": "Kannada", "status": "full"},
+        {"code": "ml", "name": "Malayalam", "status": "full"},
+        {"code": "pa", "name": "Punjabi", "status": "full"},
+        {"code": "ur", "name": "Urdu", "status": "full"},
+        {"code": "ne", "name": "Nepali", "status": "full"},
+        {"code": "or", "name": "Odia", "status": "fallback", "fallback_to": "te"},
+        {"code": "as", "name": "Assamese", "status": "fallback", "fallback_to": "bn"},
+        {"code": "sa", "name": "Sanskrit", "status": "fallback", "fallback_to": "hi"},
+        {"code": "kok", "name": "Konkani", "status": "fallback", "fallback_to": "mr"},
+        {"code": "mai", "name": "Maithili", "status": "fallback", "fallback_to": "hi"},
+        {"code": "doi", "name": "Dogri", "status": "fallback", "fallback_to": "hi"},
+        {"code": "sd", "name": "Sindhi", "status": "fallback", "fallback_to": "ur"},
+        {"code": "ks", "name": "Kashmiri", "status": "fallback", "fallback_to": "ur"},
+        {"code": "mni", "name": "Manipuri", "status": "fallback", "fallback_to": "bn"},
+        {"code": "sat", "name": "Santali", "status": "limited", "fallback_to": "en"},
+        {"code": "brx", "name": "Bodo", "status": "fallback", "fallback_to": "hi"},
+    )
+)
+
 # Unicode ranges for Indian scripts - for language detection
 SCRIPT_RANGES = {
     "devanagari": ('\u0900', '\u097F'),      # Hindi, Marathi, Nepali, Sanskrit
@@ -79,6 +124,95 @@ SCRIPT_TO_LANG = {
     "extended_arabic": "ur",
 }
 
+# Sorted code point boundaries of SCRIPT_RANGES; the script of a code point
+# cp is _BOUNDARY_SCRIPTS[searchsorted(_SCRIPT_BOUNDARIES, cp, side="right")],
+# with None for code points outside every range
+_boundaries: List[int] = []
+_BOUNDARY_SCRIPTS: List[Optional[str]] = [None]
+for _script, (_start, _end) in sorted(SCRIPT_RANGES.items(), key=lambda item: item[1][0]):
+    if _boundaries and _boundaries[-1] == ord(_start):
+        _BOUNDARY_SCRIPTS[-1] = _script
+    else:
+        _boundaries.append(ord(_start))
+        _BOUNDARY_SCRIPTS.append(_script)
+    _boundaries.append(ord(_end) + 1)
+    _BOUNDARY_SCRIPTS.append(None)
+_SCRIPT_BOUNDARIES = np.array(_boundaries, dtype=np.uint32)
+del _boundaries, _script, _start, _end
+
+# Dense lookup table of bucket ids for every code point below the last
+# boundary (3.5 KiB), so classifying a character is a single load. Latin
+# letters get their own id, one past the script buckets: characters with
+# 'a' <= c.lower() <= 'z', i.e. ASCII letters plus U+0130 (İ) and, above
+# the table, U+212A (Kelvin sign)
+_LATIN_BUCKET = len(_BOUNDARY_SCRIPTS)
+_SCRIPT_LUT = np.searchsorted(
+    _SCRIPT_BOUNDARIES, np.arange(_SCRIPT_BOUNDARIES[-1]), side="right"
+).astype(np.uint8)
+_SCRIPT_LUT[[ord(c) for c in string.ascii_letters + "\u0130"]] = _LATIN_BUCKET
+
+# Language code detect_all_languages reports for a PaddleOCR language that
+# shares its script with another (identity for the rest)
+_DETECTED_AS = {
+    "mr": "hi",  # Devanagari
+    "ne": "hi",  # Devanagari
+}
+
+# Confidence of an OCR text block dict
+_block_confidence = itemgetter("confidence")
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _count_script_buckets(codepoints, lut, n_buckets):
+        """
+        Count code points per bucket in one native loop.
+        
+        Slot `n_buckets` of the result holds the Latin count.
+        """
+        counts = np.zeros(n_buckets + 1, dtype=np.int64)
+        lut_size = lut.shape[0]
+        for cp in codepoints:
+            if cp < lut_size:
+                counts[lut[cp]] += 1
+            elif cp == 0x212A:
+                counts[n_buckets] += 1
+            else:
+                counts[n_buckets - 1] += 1
+        return counts
+else:
+    def _count_script_buckets(codepoints, lut, n_buckets):
+        """
+        Count code points per bucket with one NumPy gather.
+        
+        Slot `n_buckets` of the result holds the Latin count.
+        """
+        buckets = lut[np.minimum(codepoints, lut.size - 1)]
+        buckets[codepoints >= lut.size] = n_buckets - 1
+        buckets[codepoints == 0x212A] = n_buckets
+        return np.bincount(buckets, minlength=n_buckets + 1)
+
+
+def _count_scripts(text: str) -> Dict[str, int]:
+    """
+    Count characters per script over the code points of `text`.
+    
+    Returns counts for every script in SCRIPT_RANGES order, then "latin".
+    """
+    codepoints = np.frombuffer(
+        text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32
+    )
+    *bucket_counts, latin_count = _count_script_buckets(
+        codepoints, _SCRIPT_LUT, _LATIN_BUCKET
+    ).tolist()
+    
+    counts = dict.fromkeys(SCRIPT_RANGES, 0)
+    for script, count in zip(_BOUNDARY_SCRIPTS, bucket_counts):
+        if script is not None:
+            counts[script] += count
+    counts["latin"] = latin_count
+    return counts
+
 
 class OCRService:
     """
@@ -93,61 +227,142 @@ class OCRService:
     
     def __init__(self):
         settings = get_settings()
-        self._ocr_instances: Dict[str, PaddleOCR] = {}
+        # Least recently used language first
+        self._ocr_instances: "OrderedDict[str, PaddleOCR]" = OrderedDict()
+        self._ocr_call_count: Dict[str, int] = {}
+        self.max_cached_langs = max(1, settings.ocr_max_cached_langs)
+        self.recycle_after = settings.ocr_recycle_after
         self.default_lang = settings.ocr_languages_list[0] if settings.ocr_languages_list else "en"
         self.use_gpu = settings.use_gpu
+        self.rec_batch_num = settings.ocr_rec_batch_num
+        self.parallel_workers = settings.ocr_parallel_workers
+        self.adaptive_multilingual = settings.ocr_adaptive_multilingual
+        self.adaptive_min_confidence = settings.ocr_adaptive_min_confidence
         self.language_map = PADDLEOCR_LANGUAGES
+        self._resolved_langs: Dict[str, str] = {}
+        self._ocr_lock = threading.Lock()  # Guards the instance cache only
+        self._ocr_build_locks: Dict[str, threading.Lock] = {}
+        self._predict_locks: Dict[str, threading.Lock] = {}  # Per resolved language
+        
+        # Load models for the configured languages off the request path
+        if settings.ocr_preload:
+            threading.Thread(
+                target=self._warm,
+                args=(settings.ocr_languages_list[:self.max_cached_langs],),
+                name="ocr-preload",
+                daemon=True,
+            ).start()
+    
+    def _warm(self, languages: List[str]) -> None:
+        """Initialize PaddleOCR instances for `languages` ahead of first use."""
+        for lang in languages:
+            try:
+                self._get_ocr(lang)
+            except Exception as e:
+                logger.error(f"Failed to preload PaddleOCR for '{lang}': {e}")
     
-    def get_supported_languages(self) -> List[Dict[str, str]]:
+    def get_supported_languages(self) -> List[Mapping[str, str]]:
         """Get list of all supported languages with their status."""
-        return [
-            {"code": "en", "name": "English", "status": "full"},
-            {"code": "hi", "name": "Hindi", "status": "full"},
-            {"code": "bn", "name": "Bengali", "status": "full"},
-            {"code": "te", "name": "Telugu", "status": "full"},
-            {"code": "mr", "name": "Marathi", "status": "full"},
-            {"code": "ta", "name": "Tamil", "status": "full"},
-            {"code": "gu", "name": "Gujarati", "status": "full"},
-            {"code": "kn", "name": "Kannada", "status": "full"},
-            {"code": "ml", "name": "Malayalam", "status": "full"},
-            {"code": "pa", "name": "Punjabi", "status": "full"},
-            {"code": "ur", "name": "Urdu", "status": "full"},
-            {"code": "ne", "name": "Nepali", "status": "full"},
-            {"code": "or", "name": "Odia", "status": "fallback", "fallback_to": "te"},
-            {"code": "as", "name": "Assamese", "status": "fallback", "fallback_to": "bn"},
-            {"code": "sa", "name": "Sanskrit", "status": "fallback", "fallback_to": "hi"},
-            {"code": "kok", "name": "Konkani", "status": "fallback", "fallback_to": "mr"},
-            {"code": "mai", "name": "Maithili", "status": "fallback", "fallback_to": "hi"},
-            {"code": "doi", "name": "Dogri", "status": "fallback", "fallback_to": "hi"},
-            {"code": "sd", "name": "Sindhi", "status": "fallback", "fallback_to": "ur"},
-            {"code": "ks", "name": "Kashmiri", "status": "fallback", "fallback_to": "ur"},
-            {"code": "mni", "name": "Manipuri", "status": "fallback", "fallback_to": "bn"},
-            {"code": "sat", "name": "Santali", "status": "limited", "fallback_to": "en"},
-            {"code": "brx", "name": "Bodo", "status": "fallback", "fallback_to": "hi"},
-        ]
+        return list(SUPPORTED_LANGUAGES)
     
     def _resolve_language(self, lang: str) -> str:
-        """Resolve language code to PaddleOCR supported code."""
-        lang = lang.lower().strip()
-        if lang in self.language_map:
-            resolved = self.language_map[lang]
-            if resolved != lang:
-                logger.info(f"Language '{lang}' mapped to '{resolved}' (fallback)")
+        """
+        Resolve language code to PaddleOCR supported code.
+        
+        Results are memoized per normalized supported code, so a fallback is
+        logged once; unknown codes (the request's language is client input)
+        resolve to English without being stored, keeping the memo bounded
+        by PADDLEOCR_LANGUAGES. Entries are written with dict.setdefault,
+        which is atomic, so parallel passes can share the memo.
+        """
+        normalized = lang.lower().strip()
+        resolved = self._resolved_langs.get(normalized)
+        if resolved is not None:
             return resolved
-        return "en"  # Default fallback
+        
+        if normalized not in self.language_map:
+            return "en"  # Default fallback
+        
+        resolved = self.language_map[normalized]
+        if resolved != normalized:
+            logger.info(f"Language '{normalized}' mapped to '{resolved}' (fallback)")
+        return self._resolved_langs.setdefault(normalized, resolved)
     
-    def _get_ocr(self, lang: str = "en") -> PaddleOCR:
-        """Get or create PaddleOCR instance for a language."""
-        resolved_lang = self._resolve_language(lang)
+    def _get_ocr(self, lang: str = "en") -> "PaddleOCR":
+        """
+        Get or create PaddleOCR instance for a language.
+        
+        Instances are cached per language, up to `max_cached_langs` (least
+        recently used evicted first), and rebuilt after `recycle_after` uses
+        to release the memory PaddleOCR accumulates across inferences.
         
-        if resolved_lang not in self._ocr_instances:
+        `_ocr_lock` only guards the cache bookkeeping. Building an instance
+        (seconds) and reclaiming dropped ones happen outside it, so other
+        languages keep serving meanwhile; a per-language build lock stops
+        two threads from building the same language twice.
+        """
+        resolved_lang = self._resolve_language(lang)
+        released = []
+        
+        with self._ocr_lock:
+            calls = self._ocr_call_count.get(resolved_lang, 0) + 1
+            if self.recycle_after > 0 and calls > self.recycle_after:
+                logger.info(f"Recycling PaddleOCR for language: {resolved_lang}")
+                released.append(self._ocr_instances.pop(resolved_lang, None))
+                calls = 1
+            self._ocr_call_count[resolved_lang] = calls
+            
+            instance = self._cached_ocr(resolved_lang)
+            build_lock = self._ocr_build_locks.setdefault(resolved_lang, threading.Lock())
+        
+        self._release_ocr(released)
+        if instance is not None:
+            return instance
+        
+        with build_lock:
+            # Another thread may have built it while this one waited
+            with self._ocr_lock:
+                instance = self._cached_ocr(resolved_lang)
+            if instance is not None:
+                return instance
+            
+            # Imported here so processes that never run OCR skip loading Paddle
+            from paddleocr import PaddleOCR
+            
             logger.info(f"Initializing PaddleOCR for language: {resolved_lang}")
             # Note: use_gpu and show_log parameters removed - PaddleOCR 3.x doesn't support them
-            self._ocr_instances[resolved_lang] = PaddleOCR(
+            # Batch sizes (rec_batch_num / cls_batch_num in 2.x) size the
+            # inference memory arena that every cached language instance keeps
+            instance = PaddleOCR(
                 use_angle_cls=True,
                 lang=resolved_lang,
+                text_recognition_batch_size=self.rec_batch_num,
+                textline_orientation_batch_size=self.rec_batch_num,
             )
-        return self._ocr_instances[resolved_lang]
+            
+            with self._ocr_lock:
+                self._ocr_instances[resolved_lang] = instance
+                while len(self._ocr_instances) > self.max_cached_langs:
+                    evicted_lang = next(iter(self._ocr_instances))
+                    logger.info(f"Evicting PaddleOCR for language: {evicted_lang}")
+                    released.append(self._ocr_instances.pop(evicted_lang))
+                    self._ocr_call_count.pop(evicted_lang, None)
+        
+        self._release_ocr(released)
+        return instance
+    
+    def _cached_ocr(self, resolved_lang: str) -> Optional["PaddleOCR"]:
+        """Cached instance for a language, marked most recently used; caller holds `_ocr_lock`."""
+        instance = self._ocr_instances.get(resolved_lang)
+        if instance is not None:
+            self._ocr_instances.move_to_end(resolved_lang)
+        return instance
+    
+    def _release_ocr(self, released: List[Optional["PaddleOCR"]]) -> None:
+        """Drop released PaddleOCR instances and reclaim their memory."""
+        if any(instance is not None for instance in released):
+            released.clear()
+            gc.collect()
     
     def extract_text_from_image(
         self, 
@@ -168,26 +383,32 @@ class OCRService:
         """
         lang = lang or self.default_lang
         ocr = self._get_ocr(lang)
+        # Paddle predictors are not thread-safe: one inference per model at a time
+        predict_lock = self._predict_locks.setdefault(
+            self._resolve_language(lang), threading.Lock()
+        )
         
         # Convert PIL Image to numpy if needed
         if isinstance(image, Image.Image):
-            image = np.array(image)
+            image = self._image_to_array(image)
         elif isinstance(image, (str, Path)):
-            image = np.array(Image.open(image))
+            with Image.open(image) as img:
+                image = self._image_to_array(img)
         
-        try:
-            # PaddleOCR 3.x uses predict() method instead of ocr()
-            result = ocr.predict(image)
-        except TypeError:
-            # Fallback for older API
+        with predict_lock:
             try:
-                result = ocr.ocr(image)
+                # PaddleOCR 3.x uses predict() method instead of ocr()
+                result = ocr.predict(image)
+            except TypeError:
+                # Fallback for older API
+                try:
+                    result = ocr.ocr(image)
+                except Exception as e:
+                    logger.error(f"OCR failed: {e}")
+                    return []
             except Exception as e:
                 logger.error(f"OCR failed: {e}")
                 return []
-        except Exception as e:
-            logger.error(f"OCR failed: {e}")
-            return []
         
         if not result:
             return []
@@ -254,6 +475,16 @@ class OCRService:
         
         return text_blocks
     
+    def _image_to_array(self, image: Image.Image) -> np.ndarray:
+        """
+        Convert a PIL image to a NumPy array for inference.
+        
+        np.asarray wraps the pixels PIL exports (one tobytes() copy) instead
+        of copying them a second time as np.array does. The result is
+        read-only, which is all PaddleOCR inference needs.
+        """
+        return np.asarray(image)
+    
     def extract_text_from_page(
         self,
         page_image: np.ndarray | Image.Image,
@@ -273,13 +504,25 @@ class OCRService:
             return "", 0.0, []
         
         # Sort by Y position then X position (reading order)
-        text_blocks.sort(key=lambda b: (b["bounding_box"].y, b["bounding_box"].x))
+        text_blocks = self._sort_reading_order(text_blocks)
         
         full_text = "\n".join([b["text"] for b in text_blocks])
-        avg_confidence = sum(b["confidence"] for b in text_blocks) / len(text_blocks)
+        avg_confidence = sum(map(_block_confidence, text_blocks)) / len(text_blocks)
         
         return full_text, avg_confidence, text_blocks
     
+    def _sort_reading_order(self, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort blocks by Y position then X position (reading order).
+        
+        The coordinates are pulled out once into arrays and ordered with a
+        stable np.lexsort, instead of comparing (y, x) tuples in list.sort.
+        """
+        boxes = [block["bounding_box"] for block in blocks]
+        ys = np.fromiter((box.y for box in boxes), dtype=np.float64, count=len(boxes))
+        xs = np.fromiter((box.x for box in boxes), dtype=np.float64, count=len(boxes))
+        return [blocks[idx] for idx in np.lexsort((xs, ys)).tolist()]
+    
     def detect_language(self, text_blocks: List[Dict[str, Any]]) -> str:
         """
         Detect primary language from extracted text.
@@ -288,18 +531,12 @@ class OCRService:
         """
         full_text = " ".join([b["text"] for b in text_blocks])
         
-        # Count characters by script
-        script_counts = {}
-        
-        for script_name, (start, end) in SCRIPT_RANGES.items():
-            count = sum(1 for c in full_text if start <= c <= end)
-            if count > 0:
-                script_counts[script_name] = count
-        
-        # Count Latin characters
-        latin_count = sum(1 for c in full_text if 'a' <= c.lower() <= 'z')
-        if latin_count > 0:
-            script_counts["latin"] = latin_count
+        # Count characters by script (Latin included)
+        script_counts = {
+            script_name: count
+            for script_name, count in _count_scripts(full_text).items()
+            if count > 0
+        }
         
         if not script_counts:
             return "en"
@@ -320,15 +557,15 @@ class OCRService:
         """
         full_text = " ".join([b["text"] for b in text_blocks])
         detected = []
+        script_counts = _count_scripts(full_text)
         
         # Check Latin
-        latin_count = sum(1 for c in full_text if 'a' <= c.lower() <= 'z')
-        if latin_count > 10:
+        if script_counts["latin"] > 10:
             detected.append("en")
         
         # Check each Indic script
-        for script_name, (start, end) in SCRIPT_RANGES.items():
-            count = sum(1 for c in full_text if start <= c <= end)
+        for script_name in SCRIPT_RANGES:
+            count = script_counts[script_name]
             if count > 10:  # Threshold to avoid false positives
                 lang = SCRIPT_TO_LANG.get(script_name)
                 if lang and lang not in detected:
@@ -349,10 +586,28 @@ class OCRService:
         if languages is None:
             languages = ["en", "hi"]  # Default: English + Hindi
         
+        # Codes sharing a PaddleOCR model (e.g. "hi" and "mai") would repeat
+        # the same pass; keep the first code given for each model
+        passes: Dict[str, str] = {}
+        for lang in languages:
+            passes.setdefault(self._resolve_language(lang), lang)
+        languages = list(passes.values())
+        
+        # Convert once; every pass reads the same array
+        if isinstance(page_image, Image.Image):
+            page_image = self._image_to_array(page_image)
+        
         all_blocks = []
         
-        for lang in languages:
-            text_blocks = self.extract_text_from_image(page_image, lang)
+        if self.adaptive_multilingual and len(languages) > 1:
+            # Run the first language alone and only add passes it cannot cover
+            first_blocks = self.extract_text_from_image(page_image, languages[0])
+            remaining = self._languages_to_rerun(first_blocks, languages[1:])
+            results = [first_blocks] + self._ocr_passes(page_image, remaining)
+        else:
+            results = self._ocr_passes(page_image, languages)
+        
+        for text_blocks in results:
             all_blocks.extend(text_blocks)
         
         if not all_blocks:
@@ -362,50 +617,154 @@ class OCRService:
         unique_blocks = self._deduplicate_blocks(all_blocks)
         
         # Sort by reading order
-        unique_blocks.sort(key=lambda b: (b["bounding_box"].y, b["bounding_box"].x))
+        unique_blocks = self._sort_reading_order(unique_blocks)
         
         full_text = "\n".join([b["text"] for b in unique_blocks])
-        avg_confidence = sum(b["confidence"] for b in unique_blocks) / len(unique_blocks)
+        avg_confidence = sum(map(_block_confidence, unique_blocks)) / len(unique_blocks)
         
         return full_text, avg_confidence, unique_blocks
     
+    def _ocr_passes(
+        self,
+        page_image: np.ndarray | Image.Image,
+        languages: List[str]
+    ) -> List[List[Dict[str, Any]]]:
+        """Run one OCR pass per language, returning text blocks in language order."""
+        # Languages reach here deduplicated by model, so each pass has its own
+        # PaddleOCR instance; inference releases the GIL, so the passes can
+        # run side by side, and map keeps their order
+        workers = min(len(languages), self.parallel_workers)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(
+                    lambda lang: self.extract_text_from_image(page_image, lang),
+                    languages
+                ))
+        return [self.extract_text_from_image(page_image, lang) for lang in languages]
+    
+    def _languages_to_rerun(
+        self,
+        first_blocks: List[Dict[str, Any]],
+        languages: List[str]
+    ) -> List[str]:
+        """
+        Pick the extra passes still needed after a first multilingual pass.
+        
+        Passes are only skipped when the first one found text and read all
+        of it confidently; then only languages whose script shows up in that
+        text are kept. A blank first pass (a failed pass, or a page written
+        only in another script) or a low-confidence block, which may be
+        another script misread, runs every language.
+        """
+        if not first_blocks or any(
+            b["confidence"] < self.adaptive_min_confidence for b in first_blocks
+        ):
+            return languages
+        
+        detected = set(self.detect_all_languages(first_blocks))
+        rerun = []
+        for lang in languages:
+            resolved = self._resolve_language(lang)
+            if _DETECTED_AS.get(resolved, resolved) in detected:
+                rerun.append(lang)
+        return rerun
+    
     def _deduplicate_blocks(self, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate text blocks based on bounding box overlap."""
+        """
+        Remove duplicate text blocks based on bounding box overlap.
+        
+        Two blocks can only overlap by more than half the smaller area if
+        the smaller block's center lies inside the other box, so candidate
+        pairs are found from block centers alone: centers are sorted by y,
+        each block takes the run of centers within its rows and keeps those
+        within its columns. The overlap test then runs once, vectorized,
+        over the candidate pairs. Each block is matched against the first
+        overlapping kept block in keep order; a block that beats it on
+        confidence replaces it at the end of that order.
+        """
         if not blocks:
             return []
         
-        unique = []
-        for block in blocks:
-            is_duplicate = False
-            for existing in unique:
-                if self._boxes_overlap(block["bounding_box"], existing["bounding_box"]):
-                    # Keep the one with higher confidence
-                    if block["confidence"] > existing["confidence"]:
-                        unique.remove(existing)
-                        unique.append(block)
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
-                unique.append(block)
-        
-        return unique
+        # (N, 4) array of [x, y, width, height], one row per block
+        boxes = np.array(
+            [
+                (bbox.x, bbox.y, bbox.width, bbox.height)
+                for bbox in (block["bounding_box"] for block in blocks)
+            ],
+            dtype=np.float64
+        )
+        centers = boxes[:, :2] + boxes[:, 2:] / 2
+        
+        # Run [lo, hi) of y-sorted centers falling within each block's rows
+        by_y = np.argsort(centers[:, 1], kind="stable")
+        sorted_cy = centers[by_y, 1]
+        lo = np.searchsorted(sorted_cy, boxes[:, 1], side="left")
+        hi = np.searchsorted(sorted_cy, boxes[:, 1] + boxes[:, 3], side="right")
+        counts = np.maximum(hi - lo, 0)
+        
+        # Expand the runs into (block, center) pairs and keep centers inside
+        # the block's columns
+        owner = np.repeat(np.arange(len(blocks)), counts)
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        member = by_y[starts + np.arange(len(owner))]
+        member_cx = centers[member, 0]
+        inside = (
+            (member != owner)
+            & (member_cx >= boxes[owner, 0])
+            & (member_cx <= boxes[owner, 0] + boxes[owner, 2])
+        )
+        
+        # Candidate pairs (later block, earlier block), each pair once
+        pair_keys = np.unique(
+            np.maximum(owner[inside], member[inside]) * len(blocks)
+            + np.minimum(owner[inside], member[inside])
+        )
+        later = pair_keys // len(blocks)
+        earlier = pair_keys % len(blocks)
+        
+        overlapping: Dict[int, List[int]] = {}
+        overlaps = self._boxes_overlap(boxes[later], boxes[earlier])
+        for block_idx, other_idx in zip(later[overlaps].tolist(), earlier[overlaps].tolist()):
+            overlapping.setdefault(block_idx, []).append(other_idx)
+        
+        # Blocks are kept as they are visited, so keep order is index order
+        kept = set()
+        for block_idx, block in enumerate(blocks):
+            duplicates = [
+                other_idx for other_idx in overlapping.get(block_idx, ()) if other_idx in kept
+            ]
+            if duplicates:
+                existing_idx = min(duplicates)
+                # Keep the one with higher confidence
+                if block["confidence"] > blocks[existing_idx]["confidence"]:
+                    kept.remove(existing_idx)
+                    kept.add(block_idx)
+                continue
+            kept.add(block_idx)
+        
+        return [blocks[block_idx] for block_idx in sorted(kept)]
     
-    def _boxes_overlap(self, box1: BoundingBox, box2: BoundingBox, threshold: float = 0.5) -> bool:
-        """Check if two bounding boxes overlap significantly."""
-        x1 = max(box1.x, box2.x)
-        y1 = max(box1.y, box2.y)
-        x2 = min(box1.x + box1.width, box2.x + box2.width)
-        y2 = min(box1.y + box1.height, box2.y + box2.height)
-        
-        if x2 < x1 or y2 < y1:
-            return False
-        
-        intersection = (x2 - x1) * (y2 - y1)
-        area1 = box1.width * box1.height
-        area2 = box2.width * box2.height
-        
-        overlap_ratio = intersection / min(area1, area2) if min(area1, area2) > 0 else 0
-        return overlap_ratio > threshold
+    def _boxes_overlap(
+        self, boxes1: np.ndarray, boxes2: np.ndarray, threshold: float = 0.5
+    ) -> np.ndarray:
+        """
+        Check which pairs of bounding boxes overlap significantly.
+        
+        Both arrays hold [x, y, width, height] rows; row i of `boxes1` is
+        compared with row i of `boxes2`.
+        """
+        x1 = np.maximum(boxes1[:, 0], boxes2[:, 0])
+        y1 = np.maximum(boxes1[:, 1], boxes2[:, 1])
+        x2 = np.minimum(boxes1[:, 0] + boxes1[:, 2], boxes2[:, 0] + boxes2[:, 2])
+        y2 = np.minimum(boxes1[:, 1] + boxes1[:, 3], boxes2[:, 1] + boxes2[:, 3])
+        
+        inter_w = x2 - x1
+        inter_h = y2 - y1
+        min_area = np.minimum(boxes1[:, 2] * boxes1[:, 3], boxes2[:, 2] * boxes2[:, 3])
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            overlap_ratio = (inter_w * inter_h) / min_area
+        return (inter_w >= 0) & (inter_h >= 0) & (min_area > 0) & (overlap_ratio > threshold)
 
 
 # Singleton instance
@@ -417,4 +776,6 @@ def get_ocr_service() -> OCRService:
     global _ocr_service
     if _ocr_service is None:
         _ocr_service = OCRService()
+        # Load (or compile) the script counting kernel before the first request
+        _count_scripts("")
     return _ocr_service
@@ -1,23 +1,43 @@
 """Document AI Parser - Table Extraction Service using Camelot"""
+import importlib.util
 import logging
-from typing import List, Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Optional
 from pathlib import Path
 import tempfile
 import uuid
 
+import fitz  # PyMuPDF
+
+from app.config import get_settings
 from app.models.document import ExtractedTable, TableCell, BoundingBox
 
 logger = logging.getLogger(__name__)
 
-# Try to import camelot - it's optional
-try:
-    import camelot
-    CAMELOT_AVAILABLE = True
-except ImportError:
-    CAMELOT_AVAILABLE = False
+# Camelot is optional and heavy (pandas, OpenCV, PDF backends): check that
+# it is installed here, but only import it on first use
+CAMELOT_AVAILABLE = importlib.util.find_spec("camelot") is not None
+if not CAMELOT_AVAILABLE:
     logger.warning("Camelot not available. Table extraction will be limited.")
 
 
+@lru_cache(maxsize=1)
+def _load_camelot():
+    """Import camelot once, returning None if the import fails."""
+    try:
+        import camelot
+    except ImportError as e:
+        logger.warning(f"Camelot not available. Table extraction will be limited: {e}")
+        return None
+    return camelot
+
+
+# Pages each worker process parses per task when tables run in parallel
+_PAGES_PER_TASK = 4
+
+
 class TableService:
     """
     Table extraction service using Camelot.
@@ -26,7 +46,10 @@ class TableService:
     """
     
     def __init__(self):
+        settings = get_settings()
         self.camelot_available = CAMELOT_AVAILABLE
+        self.table_workers = settings.table_workers
+        self.table_parallel_min_pages = settings.table_parallel_min_pages
     
     def extract_tables_from_pdf(
         self,
@@ -45,40 +68,129 @@ class TableService:
         Returns:
             List of extracted tables
         """
-        if not self.camelot_available:
+        return list(self.iter_tables_from_pdf(pdf_path, pages, flavor))
+    
+    def iter_tables_from_pdf(
+        self,
+        pdf_path: str | Path,
+        pages: str = "all",
+        flavor: str = "lattice"
+    ) -> Iterator[ExtractedTable]:
+        """
+        Extract tables from a PDF file one page at a time.
+        
+        Tables are yielded as soon as their page is parsed, so only one
+        page's Camelot output is held in memory. With the lattice flavor,
+        the pages are rescanned with stream if no ruled table was found.
+        
+        Args:
+            pdf_path: Path to PDF file
+            pages: Pages to process ("all", "1", "1,2,3", "1-3")
+            flavor: "lattice" for tables with lines, "stream" for whitespace-separated
+        """
+        if not self.camelot_available or _load_camelot() is None:
             logger.warning("Camelot not available. Returning empty tables.")
-            return []
+            return
         
         pdf_path = str(pdf_path)
-        extracted_tables = []
         
         try:
-            # Try lattice first (tables with clear lines)
-            tables = camelot.read_pdf(
-                pdf_path,
-                pages=pages,
-                flavor=flavor,
-                suppress_stdout=True
-            )
-            
-            # If no tables found with lattice, try stream
-            if len(tables) == 0 and flavor == "lattice":
-                tables = camelot.read_pdf(
+            with fitz.open(pdf_path) as doc:
+                page_numbers = self._expand_pages(pages, len(doc))
+        except Exception as e:
+            logger.error(f"Table extraction failed: {e}")
+            return
+        
+        found = False
+        for extracted_table in self._extract_pages(pdf_path, page_numbers, flavor):
+            found = True
+            if extracted_table:
+                yield extracted_table
+        
+        # If no tables found with lattice anywhere, try stream
+        if not found and flavor == "lattice":
+            for extracted_table in self._extract_pages(pdf_path, page_numbers, "stream"):
+                if extracted_table:
+                    yield extracted_table
+    
+    def _extract_pages(
+        self, pdf_path: str, page_numbers: List[int], flavor: str
+    ) -> Iterator[Optional[ExtractedTable]]:
+        """
+        Parse and convert the tables of `page_numbers`, in page order.
+        
+        Yields one item per Camelot table (None where conversion dropped
+        it). Long page lists are split across worker processes when
+        configured, falling back to the serial path if the pool fails.
+        """
+        if self.table_workers > 1 and len(page_numbers) >= self.table_parallel_min_pages:
+            chunks = [
+                page_numbers[start:start + _PAGES_PER_TASK]
+                for start in range(0, len(page_numbers), _PAGES_PER_TASK)
+            ]
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.table_workers, len(chunks)),
+                    mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    results = list(executor.map(
+                        _extract_page_chunk,
+                        [pdf_path] * len(chunks),
+                        chunks,
+                        [flavor] * len(chunks)
+                    ))
+            except Exception as e:
+                logger.warning(f"Parallel table extraction failed, extracting serially: {e}")
+            else:
+                for chunk_tables in results:
+                    yield from chunk_tables
+                return
+        
+        yield from self._extract_pages_serial(pdf_path, page_numbers, flavor)
+    
+    def _extract_pages_serial(
+        self, pdf_path: str, page_numbers: List[int], flavor: str
+    ) -> Iterator[Optional[ExtractedTable]]:
+        """Parse and convert the tables of `page_numbers` in this process."""
+        for table_idx, table in enumerate(self._read_pages(pdf_path, page_numbers, flavor)):
+            yield self._convert_camelot_table(table, table_idx)
+    
+    def _read_pages(self, pdf_path: str, page_numbers: List[int], flavor: str) -> Iterator:
+        """Run Camelot one page at a time, yielding its raw tables."""
+        for page_num in page_numbers:
+            try:
+                tables = _load_camelot().read_pdf(
                     pdf_path,
-                    pages=pages,
-                    flavor="stream",
+                    pages=str(page_num),
+                    flavor=flavor,
                     suppress_stdout=True
                 )
+            except Exception as e:
+                logger.error(f"Table extraction failed on page {page_num}: {e}")
+                continue
             
-            for idx, table in enumerate(tables):
-                extracted_table = self._convert_camelot_table(table, idx)
-                if extracted_table:
-                    extracted_tables.append(extracted_table)
-                    
-        except Exception as e:
-            logger.error(f"Table extraction failed: {e}")
+            yield from tables
+    
+    def _expand_pages(self, pages: str, page_count: int) -> List[int]:
+        """
+        Expand a Camelot page spec ("all", "1,3", "2-4", "5-end") to page numbers.
+        
+        Like Camelot, repeated pages are dropped and pages come back sorted.
+        """
+        if pages.strip() == "all":
+            return list(range(1, page_count + 1))
+        
+        page_numbers = []
+        for part in pages.split(","):
+            part = part.strip()
+            if "-" in part:
+                start, end = part.split("-", 1)
+                stop = page_count if end.strip() == "end" else int(end)
+                page_numbers.extend(range(int(start), stop + 1))
+            elif part:
+                page_numbers.append(page_count if part == "end" else int(part))
         
-        return extracted_tables
+        return sorted({page_num for page_num in page_numbers if 1 <= page_num <= page_count})
     
     def _convert_camelot_table(self, table, table_idx: int) -> Optional[ExtractedTable]:
         """Convert a Camelot table to our ExtractedTable model."""
@@ -89,28 +201,21 @@ class TableService:
                 return None
             
             rows, cols = df.shape
-            cells = []
             
-            for row_idx in range(rows):
-                for col_idx in range(cols):
-                    cell_value = str(df.iloc[row_idx, col_idx])
-                    cells.append(TableCell(
-                        row=row_idx,
-                        col=col_idx,
-                        text=cell_value.strip()
-                    ))
+            # Pull every cell out of pandas once, stripped, as nested lists
+            grid = [[str(value).strip() for value in row] for row in df.to_numpy().tolist()]
+            
+            cells = [
+                TableCell(row=row_idx, col=col_idx, text=text)
+                for row_idx, row in enumerate(grid)
+                for col_idx, text in enumerate(row)
+            ]
             
             # Extract headers (first row)
-            headers = [str(df.iloc[0, col]).strip() for col in range(cols)]
+            headers = grid[0]
             
             # Convert to list of dicts (assuming first row is header)
-            data_as_dict = []
-            if rows > 1:
-                for row_idx in range(1, rows):
-                    row_dict = {}
-                    for col_idx, header in enumerate(headers):
-                        row_dict[header] = str(df.iloc[row_idx, col_idx]).strip()
-                    data_as_dict.append(row_dict)
+            data_as_dict = [dict(zip(headers, row)) for row in grid[1:]]
             
             # Get parsing accuracy from Camelot
             accuracy = table.parsing_report.get("accuracy", 100) / 100.0
@@ -144,6 +249,17 @@ class TableService:
         return []
 
 
+def _extract_page_chunk(
+    pdf_path: str, page_numbers: List[int], flavor: str
+) -> List[Optional[ExtractedTable]]:
+    """
+    Process-pool worker: parse and convert the tables of a few pages.
+    
+    Always takes the serial path, so a worker never starts a pool of its own.
+    """
+    return list(TableService()._extract_pages_serial(pdf_path, page_numbers, flavor))
+
+
 # Singleton instance
 _table_service: Optional[TableService] = None
 
@@ -0,0 +1,134 @@
+"""Tests for key-value extraction (label regexes, prefilter, byte mode)."""
+import re
+
+import pytest
+
+from app.services import kv_extraction
+from app.services.kv_extraction import (
+    KVExtractionService,
+    _FIELDS,
+    _LABELS,
+    _labels_to_trie_regex,
+)
+
+
+# Expected (key, value, confidence) triples, as produced before the label
+# regexes were rendered as tries and precompiled
+EXTRACTION_CASES = [
+    (
+        "Name: Ram Kumar\nDate: 12/01/2024\nPhone: 9876543210\nAmount: Rs. 5,000",
+        [
+            ("date", "12/01/2024", 0.9),
+            ("name", "Ram Kumar", 0.9),
+            ("phone", "9876543210", 0.9),
+            ("amount", "5,000", 0.9),
+        ],
+    ),
+    (
+        "नाम: राम कुमार\nदिनांक: 15-08-2023\nपिता का नाम: श्याम लाल",
+        [
+            ("date", "15-08-2023", 0.9),
+            ("name", "राम कुमार", 0.9),
+            ("father_name", "श्याम लाल", 0.9),
+            ("नाम", "राम कुमार", 0.7),
+            ("दिनांक", "15-08-2023", 0.7),
+            ("पिता का नाम", "श्याम लाल", 0.7),
+        ],
+    ),
+    (
+        "Case No: CRL/123/2023\nCourt: District Court, Pune\nPetitioner: ABC Ltd\n"
+        "Respondent: XYZ\nSection: 420 IPC",
+        [
+            ("case_number", "CRL/123/2023", 0.9),
+            ("court_name", "Court: District Court", 0.9),
+            ("petitioner", "ABC Ltd", 0.9),
+            ("section", "420", 0.9),
+            ("district", "Court", 0.9),
+            ("Case No", "CRL/123/2023", 0.7),
+            ("Court", "District Court, Pune", 0.7),
+            ("Respondent", "XYZ", 0.7),
+        ],
+    ),
+    (
+        "Invoice\nTotal Amount: 1,234.50\nAge: 42 years\nAddress: 12 MG Road, Bengaluru",
+        [
+            ("amount", "1,234.50", 0.9),
+            ("age", "42", 0.9),
+            ("Total Amount", "1,234.50", 0.7),
+            ("Address", "12 MG Road, Bengaluru", 0.7),
+        ],
+    ),
+]
+
+
+def _labels_by_field():
+    fields = {}
+    for field, label in zip(_FIELDS, _LABELS):
+        fields.setdefault(field, []).append(label)
+    return fields
+
+
+def _triples(pairs):
+    return [(kv.key, kv.value, kv.confidence) for kv in pairs]
+
+
+@pytest.mark.parametrize("field,labels", sorted(_labels_by_field().items()))
+def test_trie_regex_matches_like_plain_alternation(field, labels):
+    trie = re.compile(rf"(?:{_labels_to_trie_regex(labels)})[\s:]*(.+)", re.IGNORECASE)
+    plain = re.compile(
+        rf"(?:{'|'.join(re.escape(label) for label in labels)})[\s:]*(.+)", re.IGNORECASE
+    )
+
+    for label in labels:
+        text = f"{label}: Value 123"
+        # Where one label is a prefix of another the trie prefers the longer
+        # label; everywhere else it agrees with the plain alternation
+        shares_prefix = any(
+            other != label and (other.startswith(label) or label.startswith(other))
+            for other in labels
+        )
+        if not shares_prefix:
+            assert trie.search(text).group(1) == plain.search(text).group(1)
+        assert trie.search(text).group(1) == "Value 123"
+
+
+@pytest.mark.parametrize("text,expected", EXTRACTION_CASES)
+def test_extract_from_text(text, expected):
+    assert _triples(KVExtractionService().extract_from_text(text)) == expected
+
+
+@pytest.mark.parametrize("text,expected", EXTRACTION_CASES)
+def test_byte_regex_mode_matches_str_mode(text, expected):
+    service = KVExtractionService()
+    service.use_bytes_regex = True
+    assert _triples(service.extract_from_text(text)) == expected
+
+
+@pytest.mark.parametrize("text,expected", EXTRACTION_CASES)
+def test_extract_without_prefilter(monkeypatch, text, expected):
+    monkeypatch.setattr(kv_extraction, "HYPERSCAN_AVAILABLE", False)
+    service = KVExtractionService()
+    assert service._prefilter is None
+    assert _triples(service.extract_from_text(text)) == expected
+
+
+@pytest.mark.parametrize("use_bytes_regex", [False, True])
+def test_lone_surrogate_text(use_bytes_regex):
+    service = KVExtractionService()
+    service.use_bytes_regex = use_bytes_regex
+    pairs = _triples(service.extract_from_text("Name: Ram\ud835 Kumar"))
+    assert ("name", "Ram\ud835 Kumar", 0.9) in pairs
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Name:", True),
+    ("नाम", True),
+    ("DATE OF BIRTH", True),
+    ("applicant name", True),
+    ("total", True),
+    ("", True),  # "" is a substring of every label
+    ("hello world", False),
+    ("xyz qwv", False),
+])
+def test_is_label(text, expected):
+    assert KVExtractionService()._is_label(text) is expected
@@ -0,0 +1,114 @@
+"""Tests for heuristic layout detection."""
+import random
+
+import numpy as np
+import pytest
+
+from app.models.document import BoundingBox
+from app.services.layout_service import LayoutService, LayoutType
+
+
+def _reference_is_section_header(text):
+    """Section header check as written before the prefix table."""
+    text = text.strip()
+    if any(text.startswith(f"{i}.") or text.startswith(f"{i})") for i in range(1, 100)):
+        if len(text) < 100 and text.isupper() or text.istitle():
+            return True
+    for pattern in ["CHAPTER", "SECTION", "ARTICLE", "PART", "ORDER", "JUDGMENT",
+                    "PETITION", "PRAYER", "अध्याय", "धारा", "खंड"]:
+        if text.upper().startswith(pattern):
+            return True
+    return len(text) < 80 and text.isupper()
+
+
+def _reference_is_list_item(text):
+    """List item check as written before the prefix table."""
+    text = text.strip()
+    if text.startswith(("•", "-", "–", "—", "*", "○", "●")):
+        return True
+    if any(text.startswith((f"{i}.", f"({i})", f"{i})")) for i in range(1, 100)):
+        return True
+    return any(
+        text.startswith((f"{c}.", f"({c})", f"{c})"))
+        for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    )
+
+
+def _reference_classify(text, bbox, page_height, block_idx):
+    """Per-block classification as written before the NumPy masks."""
+    if bbox.y < page_height * 0.10 and len(text) < 100:
+        return LayoutType.HEADER
+    if bbox.y + bbox.height > page_height * 0.90 and len(text) < 100:
+        return LayoutType.FOOTER
+    if block_idx < 5 and len(text) < 150 and bbox.height > page_height * 0.03:
+        return LayoutType.TITLE
+    if _reference_is_section_header(text):
+        return LayoutType.SECTION_HEADER
+    if _reference_is_list_item(text):
+        return LayoutType.LIST
+    return LayoutType.TEXT
+
+
+TEXTS = [
+    "1. Introduction",
+    "12) SCOPE OF WORK",
+    "99. lower case heading",
+    "100. Not numbered",
+    "CHAPTER IV",
+    "section 3 of the act",
+    "धारा 420",
+    "SHORT UPPER",
+    "• bullet point",
+    "- dash item",
+    "(3) third clause",
+    "(b) second option",
+    "B) Upper lettered",
+    "z. last letter",
+    "Plain paragraph text that is not special at all.",
+    "   2. Padded Title Case   ",
+    "",
+    "x" * 120,
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_text_checks_match_reference(text):
+    service = LayoutService()
+    assert service._is_section_header(text) == _reference_is_section_header(text)
+    assert service._is_list_item(text) == _reference_is_list_item(text)
+
+
+def test_detect_layout_matches_reference():
+    rng = random.Random(7)
+    page_height, page_width = 1000, 800
+    blocks = [
+        {
+            "text": rng.choice(TEXTS),
+            "confidence": 0.9,
+            "bounding_box": BoundingBox(
+                x=float(rng.randint(0, 700)),
+                y=float(rng.choice([rng.randint(0, 990), 100, 900])),
+                width=float(rng.randint(10, 300)),
+                height=float(rng.choice([rng.randint(5, 60), 30])),
+            ),
+        }
+        for _ in range(200)
+    ]
+
+    elements = LayoutService().detect_layout(
+        np.zeros((page_height, page_width, 3), dtype=np.uint8), blocks
+    )
+
+    expected = sorted(
+        (
+            (block["bounding_box"].y, block["bounding_box"].x, idx,
+             _reference_classify(block["text"], block["bounding_box"], page_height, idx))
+            for idx, block in enumerate(blocks)
+        ),
+        key=lambda item: (item[0], item[1]),
+    )
+    assert [(e.bounding_box.y, e.bounding_box.x, e.element_type) for e in elements] == [
+        (y, x, element_type) for y, x, _, element_type in expected
+    ]
+    assert [e.text for e in elements] == [blocks[idx]["text"] for _, _, idx, _ in expected]
+    assert [e.order for e in elements] == list(range(len(blocks)))
@@ -0,0 +1,157 @@
+"""Tests for embedded PDF data extraction."""
+import dataclasses
+import re
+from datetime import datetime
+
+import fitz
+import pytest
+
+from app.services.metadata_service import PDFMetadataService
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Three pages of contacts (11pt text on 13pt leading), links, an annotation and a TOC."""
+    doc = fitz.open()
+    for p in range(3):
+        page = doc.new_page()
+        lines = [
+            f"Contact sales{p}@example.com for info",
+            "Call +91 98765 43210 now",
+            f"Visit https://site{p % 2}.org/page?x={p}",
+            "Mail HTTP://UPPER.example.com/x",
+            "Office 011-2345-6789",
+            "Plain line without contacts",
+        ]
+        for i, line in enumerate(lines):
+            page.insert_text((72, 100 + 13 * i), line, fontsize=11)
+        for rect, uri in [
+            ((72, 90, 300, 102), f"mailto:sales{p}@example.com?subject=hi"),
+            ((72, 116, 300, 128), f"https://site{p % 2}.org/page?x={p}"),
+            ((72, 103, 300, 115), "tel:+919876543210"),
+        ]:
+            page.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(rect), "uri": uri})
+        if p == 1:
+            annot = page.add_text_annot((400, 100), "Check this")
+            annot.set_info(title="Reviewer", content="Check this")
+            annot.update()
+    doc.set_toc([[1, "Intro", 1], [2, "Details", 2]])
+    doc.set_metadata({
+        "title": "Sample",
+        "author": "Author",
+        "creationDate": "D:20240102030405+05'30'",
+    })
+    path = tmp_path / "sample.pdf"
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _rect(y):
+    return {"x": 72.0, "y": y, "width": 228.0, "height": 12.0}
+
+
+# Expected output, as produced before the single-pass contact scan, the
+# word-based link text and the parallel page scan
+EXPECTED_LINKS = [
+    ("mailto:sales0@example.com?subject=hi", "email", 1, "Contact sales0@example.com for info", _rect(90.0)),
+    ("https://site0.org/page?x=0", "uri", 1, "Visit https://site0.org/page?x=0", _rect(116.0)),
+    ("tel:+919876543210", "phone", 1, "Call +91 98765 43210 now", _rect(103.0)),
+    ("HTTP://UPPER.example.com/x", "uri", 1, None, None),
+    ("mailto:sales1@example.com?subject=hi", "email", 2, "Contact sales1@example.com for info", _rect(90.0)),
+    ("https://site1.org/page?x=1", "uri", 2, "Visit https://site1.org/page?x=1", _rect(116.0)),
+    ("mailto:sales2@example.com?subject=hi", "email", 3, "Contact sales2@example.com for info", _rect(90.0)),
+    ("https://site0.org/page?x=2", "uri", 3, "Visit https://site0.org/page?x=2", _rect(116.0)),
+]
+EXPECTED_EMAILS = [
+    ("sales0@example.com", "link", 1, "Contact sales0@example.com for info"),
+    ("sales1@example.com", "link", 2, "Contact sales1@example.com for info"),
+    ("sales2@example.com", "link", 3, "Contact sales2@example.com for info"),
+]
+EXPECTED_PHONES = [
+    {"number": "+919876543210", "source": "link", "page_number": 1, "context": "Call +91 98765 43210 now"},
+]
+
+
+def _assert_expected(data):
+    assert [
+        (link.url, link.link_type, link.page_number, link.text, link.rect) for link in data.links
+    ] == EXPECTED_LINKS
+    assert [
+        (email.email, email.source, email.page_number, email.context) for email in data.emails
+    ] == EXPECTED_EMAILS
+    assert data.phone_numbers == EXPECTED_PHONES
+    assert [
+        (a.annotation_type, a.content, a.page_number, a.author) for a in data.annotations
+    ] == [("Text", "Check this", 2, "Reviewer")]
+    assert data.table_of_contents == [
+        {"level": 1, "title": "Intro", "page_number": 1},
+        {"level": 2, "title": "Details", "page_number": 2},
+    ]
+    assert data.metadata.title == "Sample"
+    assert data.metadata.creation_date == datetime(2024, 1, 2, 3, 4, 5)
+    assert data.metadata.page_count == 3
+    assert data.metadata.has_toc
+
+
+def test_extract_all(sample_pdf):
+    service = PDFMetadataService()
+    service.pdf_workers = 0
+    _assert_expected(service.extract_all(sample_pdf))
+
+
+def test_parallel_page_scan_matches_serial(sample_pdf):
+    serial = PDFMetadataService()
+    serial.pdf_workers = 0
+    parallel = PDFMetadataService()
+    parallel.pdf_workers = 2
+    parallel.pdf_parallel_min_pages = 1
+
+    # None would mean the pool failed and the serial path ran instead
+    assert parallel._scan_pages_parallel(sample_pdf, 3) is not None
+    data = parallel.extract_all(sample_pdf)
+
+    _assert_expected(data)
+    assert dataclasses.asdict(data) == dataclasses.asdict(serial.extract_all(sample_pdf))
+
+
+CONTACT_TEXTS = [
+    "Mail Foo.Bar+tag@Example.CO.in or visit HTTPS://Example.com/Path?q=1",
+    "hTtP://mixed.case/x and http://lower.case/y, not ftp://other.org",
+    "Call +91 98765 43210, 011-2345-6789 or 9876543210 today",
+    "user@domain.c is too short, user@domain.com is fine",
+]
+
+
+@pytest.mark.parametrize("text", CONTACT_TEXTS)
+def test_contact_patterns_match_ignorecase_versions(text):
+    service = PDFMetadataService()
+    for pattern in (service.EMAIL_PATTERN, service.PHONE_PATTERN):
+        assert pattern.findall(text) == re.compile(pattern.pattern, re.IGNORECASE).findall(text)
+    ignorecase_url = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+', re.IGNORECASE)
+    assert service.URL_PATTERN.findall(text) == ignorecase_url.findall(text)
+
+
+def test_link_text_stays_on_its_line(sample_pdf):
+    service = PDFMetadataService()
+    with fitz.open(str(sample_pdf)) as doc:
+        words = service._get_page_words(doc[0])
+        assert service._words_in_rect(words, fitz.Rect(72, 90, 300, 102)) == (
+            "Contact sales0@example.com for info"
+        )
+        assert service._words_in_rect(words, fitz.Rect(72, 90, 300, 115)) == (
+            "Contact sales0@example.com for info\nCall +91 98765 43210 now"
+        )
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("D:20240102030405+05'30'", datetime(2024, 1, 2, 3, 4, 5)),
+    ("20240102030405", datetime(2024, 1, 2, 3, 4, 5)),
+    ("D:20240102", datetime(2024, 1, 2)),
+    ("D:2024", None),
+    ("garbage", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_pdf_date(value, expected):
+    assert PDFMetadataService._parse_pdf_date(value) == expected
@@ -0,0 +1,283 @@
+"""Tests for OCR post-processing (script detection, dedup, reading order)."""
+import random
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from app.models.document import BoundingBox
+from app.services import ocr_service
+from app.services.ocr_service import (
+    OCRService,
+    PADDLEOCR_LANGUAGES,
+    SCRIPT_RANGES,
+    SCRIPT_TO_LANG,
+    _count_scripts,
+)
+
+
+def _service(**attrs):
+    """OCRService without settings, preload or PaddleOCR instances."""
+    service = OCRService.__new__(OCRService)
+    service.language_map = PADDLEOCR_LANGUAGES
+    service._resolved_langs = {}
+    service.adaptive_min_confidence = 0.85
+    for name, value in attrs.items():
+        setattr(service, name, value)
+    return service
+
+
+def _block(text, x, y, width, height, confidence=0.9):
+    return {
+        "text": text,
+        "confidence": confidence,
+        "bounding_box": BoundingBox(x=x, y=y, width=width, height=height),
+    }
+
+
+def _reference_detect_language(text_blocks):
+    """Dominant language detection as written before the script lookup table."""
+    full_text = " ".join([b["text"] for b in text_blocks])
+    script_counts = {}
+    for script_name, (start, end) in SCRIPT_RANGES.items():
+        count = sum(1 for c in full_text if start <= c <= end)
+        if count > 0:
+            script_counts[script_name] = count
+    latin_count = sum(1 for c in full_text if "a" <= c.lower() <= "z")
+    if latin_count > 0:
+        script_counts["latin"] = latin_count
+    if not script_counts:
+        return "en"
+    dominant_script = max(script_counts, key=script_counts.get)
+    if dominant_script == "latin":
+        return "en"
+    return SCRIPT_TO_LANG.get(dominant_script, "en")
+
+
+def _reference_detect_all_languages(text_blocks):
+    """Multi-language detection as written before the script lookup table."""
+    full_text = " ".join([b["text"] for b in text_blocks])
+    detected = []
+    if sum(1 for c in full_text if "a" <= c.lower() <= "z") > 10:
+        detected.append("en")
+    for script_name, (start, end) in SCRIPT_RANGES.items():
+        if sum(1 for c in full_text if start <= c <= end) > 10:
+            lang = SCRIPT_TO_LANG.get(script_name)
+            if lang and lang not in detected:
+                detected.append(lang)
+    return detected if detected else ["en"]
+
+
+def _reference_boxes_overlap(box1, box2, threshold=0.5):
+    """Scalar overlap test as written before vectorization."""
+    x1 = max(box1.x, box2.x)
+    y1 = max(box1.y, box2.y)
+    x2 = min(box1.x + box1.width, box2.x + box2.width)
+    y2 = min(box1.y + box1.height, box2.y + box2.height)
+    if x2 < x1 or y2 < y1:
+        return False
+    intersection = (x2 - x1) * (y2 - y1)
+    area1 = box1.width * box1.height
+    area2 = box2.width * box2.height
+    overlap_ratio = intersection / min(area1, area2) if min(area1, area2) > 0 else 0
+    return overlap_ratio > threshold
+
+
+def _reference_deduplicate(blocks):
+    """Pairwise dedup as written before the center prefilter."""
+    unique = []
+    for block in blocks:
+        is_duplicate = False
+        for existing in unique:
+            if _reference_boxes_overlap(block["bounding_box"], existing["bounding_box"]):
+                if block["confidence"] > existing["confidence"]:
+                    unique.remove(existing)
+                    unique.append(block)
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            unique.append(block)
+    return unique
+
+
+def _random_blocks(rng, count):
+    blocks = []
+    for idx in range(count):
+        blocks.append(_block(
+            str(idx),
+            x=rng.choice([rng.uniform(0, 1000), float(rng.randint(0, 20) * 32)]),
+            y=rng.uniform(0, 1000),
+            width=rng.choice([0.0, rng.uniform(1, 50), rng.uniform(1, 400), rng.uniform(1, 1500)]),
+            height=rng.choice([0.0, rng.uniform(1, 30), rng.uniform(1, 300)]),
+            confidence=rng.choice([0.5, 0.7, 0.9, rng.random()]),
+        ))
+    return blocks
+
+
+SCRIPT_TEXTS = [
+    "",
+    "Hello world, this is plain English text",
+    "नमस्ते दुनिया यह हिंदी पाठ है और कुछ और शब्द",
+    "வணக்கம் உலகம் இது தமிழ் உரை ஆகும் மேலும்",
+    "Invoice नाम राम 12345 Total ₹ 500 দাম ৫০০ টাকা",
+    "İstanbul Kelvin ſ ß ﬁ",  # code points whose lower() lands in a-z
+    "ਪੰਜਾਬੀ ગુજરાતી ಕನ್ನಡ മലയാളം తెలుగు اردو متن ہے",
+    "\U0001F600 emoji and \ud835 a lone surrogate",
+]
+
+
+@pytest.mark.parametrize("text", SCRIPT_TEXTS)
+def test_count_scripts_matches_character_loops(text):
+    counts = _count_scripts(text)
+    for script_name, (start, end) in SCRIPT_RANGES.items():
+        assert counts[script_name] == sum(1 for c in text if start <= c <= end)
+    assert counts["latin"] == sum(1 for c in text if "a" <= c.lower() <= "z")
+
+
+@pytest.mark.parametrize("text", SCRIPT_TEXTS)
+def test_language_detection_matches_reference(text):
+    service = _service()
+    blocks = [{"text": part} for part in text.split(" ")]
+    assert service.detect_language(blocks) == _reference_detect_language(blocks)
+    assert service.detect_all_languages(blocks) == _reference_detect_all_languages(blocks)
+
+
+def test_boxes_overlap_matches_scalar_reference():
+    rng = random.Random(3)
+    boxes = [block["bounding_box"] for block in _random_blocks(rng, 300)]
+    pairs = [(rng.choice(boxes), rng.choice(boxes)) for _ in range(2000)]
+    as_array = lambda items: np.array([(b.x, b.y, b.width, b.height) for b in items])
+
+    overlaps = _service()._boxes_overlap(
+        as_array([a for a, _ in pairs]), as_array([b for _, b in pairs])
+    )
+    assert overlaps.tolist() == [_reference_boxes_overlap(a, b) for a, b in pairs]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_deduplicate_blocks_matches_reference(seed):
+    rng = random.Random(seed)
+    blocks = _random_blocks(rng, rng.randint(0, 80))
+    result = _service()._deduplicate_blocks(blocks)
+    assert [b["text"] for b in result] == [b["text"] for b in _reference_deduplicate(blocks)]
+
+
+def test_deduplicate_multilingual_passes():
+    # The same lines read by two language models, slightly shifted
+    rng = random.Random(11)
+    lines = [(rng.uniform(50, 200), i * 12.0, rng.uniform(100, 900)) for i in range(60)]
+    blocks = [
+        _block(f"{lang}{i}", x + rng.uniform(-2, 2), y + rng.uniform(-1, 1), w, 10,
+               confidence=rng.random())
+        for lang in ("en", "hi") for i, (x, y, w) in enumerate(lines)
+    ]
+    result = _service()._deduplicate_blocks(blocks)
+    assert [b["text"] for b in result] == [b["text"] for b in _reference_deduplicate(blocks)]
+
+
+def test_sort_reading_order():
+    rng = random.Random(5)
+    blocks = [
+        _block(str(i), float(rng.randint(0, 5)), float(rng.randint(0, 5)), 1.0, 1.0)
+        for i in range(50)
+    ]
+    expected = sorted(blocks, key=lambda b: (b["bounding_box"].y, b["bounding_box"].x))
+    assert _service()._sort_reading_order(blocks) == expected
+
+
+def test_resolve_language_memoizes_known_codes_only():
+    service = _service()
+    assert service._resolve_language(" MAI ") == "hi"
+    assert service._resolve_language("or") == "te"
+    assert service._resolve_language("xx-unknown") == "en"
+    assert service._resolved_langs == {"mai": "hi", "or": "te"}
+
+
+def test_languages_to_rerun():
+    service = _service()
+    assert service._languages_to_rerun([], ["hi", "ta"]) == ["hi", "ta"]
+
+    low = [_block("Hello there, plain English text", 0, 0, 10, 10, confidence=0.5)]
+    assert service._languages_to_rerun(low, ["hi", "ta"]) == ["hi", "ta"]
+
+    hindi = [_block("नमस्ते दुनिया यह हिंदी पाठ है", 0, 0, 10, 10, confidence=0.95)]
+    assert service._languages_to_rerun(hindi, ["mr", "ta"]) == ["mr"]
+
+
+class _FakePaddleOCR:
+    """PaddleOCR stand-in that records concurrent predict calls per model."""
+
+    calls = []
+    overlapping = []
+    _active = {}
+    _lock = threading.Lock()
+
+    def __init__(self, lang, **kwargs):
+        self.lang = lang
+
+    def predict(self, image):
+        with self._lock:
+            self._active[self.lang] = self._active.get(self.lang, 0) + 1
+            if self._active[self.lang] > 1:
+                self.overlapping.append(self.lang)
+            self.calls.append(self.lang)
+        threading.Event().wait(0.01)
+        with self._lock:
+            self._active[self.lang] -= 1
+        poly = np.array([[0, 0], [10, 0], [10, 10], [0, 10]])
+        return [{"rec_texts": [self.lang], "rec_scores": [0.9], "dt_polys": [poly]}]
+
+
+@pytest.fixture
+def fake_paddle(monkeypatch):
+    module = types.ModuleType("paddleocr")
+    module.PaddleOCR = _FakePaddleOCR
+    monkeypatch.setitem(sys.modules, "paddleocr", module)
+    _FakePaddleOCR.calls.clear()
+    _FakePaddleOCR.overlapping.clear()
+    return _FakePaddleOCR
+
+
+def _paddle_service(**attrs):
+    return _service(
+        _ocr_instances=ocr_service.OrderedDict(),
+        _ocr_call_count={},
+        _ocr_lock=threading.Lock(),
+        _ocr_build_locks={},
+        _predict_locks={},
+        max_cached_langs=3,
+        recycle_after=0,
+        rec_batch_num=1,
+        default_lang="en",
+        parallel_workers=4,
+        adaptive_multilingual=False,
+        **attrs,
+    )
+
+
+def test_multilingual_runs_one_pass_per_model(fake_paddle):
+    service = _paddle_service()
+    image = np.zeros((20, 20, 3), dtype=np.uint8)
+
+    service.extract_multilingual(image, ["hi", "mai", "en", "en", "sa"])
+
+    assert sorted(fake_paddle.calls) == ["en", "hi"]
+
+
+def test_predict_never_overlaps_on_one_model(fake_paddle):
+    service = _paddle_service()
+    image = np.zeros((20, 20, 3), dtype=np.uint8)
+
+    threads = [
+        threading.Thread(target=service.extract_multilingual, args=(image, ["hi", "en"]))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_paddle.calls) == 8
+    assert fake_paddle.overlapping == []
@@ -0,0 +1,91 @@
+"""Tests for Camelot table extraction."""
+import fitz
+import pytest
+
+from app.services.table_service import TableService
+
+
+@pytest.fixture
+def table_pdf(tmp_path):
+    """Six pages alternating a ruled table, whitespace columns and plain text."""
+    doc = fitz.open()
+    for p in range(6):
+        page = doc.new_page()
+        if p % 3 == 0:
+            for r in range(4):
+                for c in range(3):
+                    rect = fitz.Rect(72 + c * 120, 100 + r * 24, 192 + c * 120, 124 + r * 24)
+                    page.draw_rect(rect, color=(0, 0, 0), width=1)
+                    page.insert_text((rect.x0 + 4, rect.y1 - 7), f"R{r}C{c}p{p}", fontsize=10)
+        elif p % 3 == 1:
+            for r in range(5):
+                for c in range(4):
+                    page.insert_text((72 + c * 110, 120 + r * 18), f"v{r}{c}_{p}", fontsize=10)
+        else:
+            page.insert_text((72, 100), "Just a paragraph of text with no table.", fontsize=11)
+    path = tmp_path / "tables.pdf"
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _signature(tables):
+    return [(t.page_number, t.rows, t.cols, [cell.text for cell in t.cells]) for t in tables]
+
+
+def _camelot_signature(pdf_path, pages):
+    """Tables as a single read_pdf call returned them, stream as the fallback."""
+    camelot = pytest.importorskip("camelot")
+    tables = camelot.read_pdf(pdf_path, pages=pages, flavor="lattice", suppress_stdout=True)
+    if len(tables) == 0:
+        tables = camelot.read_pdf(pdf_path, pages=pages, flavor="stream", suppress_stdout=True)
+    return [
+        (
+            int(table.page),
+            table.df.shape[0],
+            table.df.shape[1],
+            [str(value).strip() for row in table.df.to_numpy().tolist() for value in row],
+        )
+        for table in tables
+        if not table.df.empty
+    ]
+
+
+@pytest.mark.parametrize("pages,expected", [
+    ("all", [1, 2, 3, 4, 5, 6]),
+    ("2", [2]),
+    ("2-4", [2, 3, 4]),
+    ("5-end", [5, 6]),
+    ("end", [6]),
+    ("1,1-2", [1, 2]),
+    ("3,1", [1, 3]),
+    ("0,4,9", [4]),
+])
+def test_expand_pages(pages, expected):
+    assert TableService()._expand_pages(pages, 6) == expected
+
+
+@pytest.mark.parametrize("pages", ["all", "1", "2-3", "3,1", "1,1-2", "2"])
+def test_extract_matches_single_read_pdf(table_pdf, pages):
+    service = TableService()
+    service.table_workers = 0
+    assert _signature(service.extract_tables_from_pdf(table_pdf, pages)) == (
+        _camelot_signature(table_pdf, pages)
+    )
+
+
+def test_parallel_extraction_matches_serial(table_pdf, monkeypatch):
+    pytest.importorskip("camelot")
+    # Workers read these settings too; they must still take the serial path
+    monkeypatch.setenv("TABLE_WORKERS", "2")
+    monkeypatch.setenv("TABLE_PARALLEL_MIN_PAGES", "1")
+    serial = TableService()
+    serial.table_workers = 0
+    parallel = TableService()
+    parallel.table_workers = 2
+    parallel.table_parallel_min_pages = 1
+
+    for pages in ("all", "2-3"):
+        assert _signature(parallel.extract_tables_from_pdf(table_pdf, pages)) == (
+            _signature(serial.extract_tables_from_pdf(table_pdf, pages))
+        )